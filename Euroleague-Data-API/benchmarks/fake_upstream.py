@@ -0,0 +1,145 @@
+"""
+Local stand-in for api-live.euroleague.net that serves the responses in benchmarks/fixtures,
+so benchmarks measure this API rather than the network and the real upstream.
+
+The fixtures shipped with the repository are hand-built samples in the upstream's response
+shape, not recordings: payload sizes and values only approximate real ones. Replace them with
+real responses with benchmarks/record_fixtures.py before reading results as real-payload numbers.
+
+Serves the v3 endpoints the resolvers call: the clubs listing, clubs/{code}, clubs/{code}/info,
+game reports and traditional player statistics. Point the API at it with EUROLEAGUE_API_BASE_URL.
+
+Run from the Euroleague-Data-API directory:
+
+    python benchmarks/fake_upstream.py --port 8900 --latency-ms 40 --jitter-ms 10
+"""
+import argparse
+import asyncio
+import copy
+import json
+import os
+import random
+from typing import Any, Dict, List
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def load_fixture(name: str) -> Any:
+    with open(os.path.join(FIXTURES_DIR, f"{name}.json"), encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _int_param(request: Request, name: str, default: int) -> int:
+    try:
+        return int(request.query_params.get(name, default))
+    except ValueError:
+        return default
+
+
+class FakeUpstream:
+    """
+    Serves fixture-based upstream responses after a configurable delay.
+
+    Args:
+        latency_ms (float): Delay added to every response, standing in for the upstream's latency.
+        jitter_ms (float): Maximum random delay added on top of latency_ms.
+        games (int): Game codes above this return 404, like games not yet scheduled.
+        played_games (int): Game codes up to this are reported as played, the rest as upcoming.
+        leaderboard_rows (int): Total rows of the traditional statistics leaderboard.
+    """
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, games: int = 306,
+                 played_games: int = 200, leaderboard_rows: int = 350):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.games = games
+        self.played_games = played_games
+        self.leaderboard_rows = leaderboard_rows
+        self.requests = 0
+        clubs = load_fixture("clubs")
+        self.clubs: List[Dict[str, Any]] = clubs["data"]
+        self.clubs_by_code = {club["code"]: club for club in self.clubs}
+        self.club_info = load_fixture("club_info")
+        self.game_report = load_fixture("game_report")
+        self.player_rows = load_fixture("player_traditional")["players"]
+        self.leaderboard = [self._leaderboard_row(rank) for rank in range(1, leaderboard_rows + 1)]
+
+    def _leaderboard_row(self, rank: int) -> Dict[str, Any]:
+        # Cycles through the fixture rows, giving each generated player its own code and rank
+        row = copy.deepcopy(self.player_rows[(rank - 1) % len(self.player_rows)])
+        row["playerRanking"] = rank
+        row["player"]["code"] = f"P{rank:06d}"
+        return row
+
+    async def _delay(self) -> None:
+        self.requests += 1
+        delay = self.latency_ms + random.uniform(0, self.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+    async def clubs_listing(self, request: Request) -> Response:
+        await self._delay()
+        offset, limit = _int_param(request, "Offset", 0), _int_param(request, "Limit", 10)
+        return JSONResponse({"data": self.clubs[offset:offset + limit], "total": len(self.clubs)})
+
+    async def club(self, request: Request) -> Response:
+        await self._delay()
+        club = self.clubs_by_code.get(request.path_params["code"])
+        if club is None:
+            return Response(status_code=404)
+        return JSONResponse(club)
+
+    async def club_info_page(self, request: Request) -> Response:
+        await self._delay()
+        if request.path_params["code"] not in self.clubs_by_code:
+            return Response(status_code=404)
+        return JSONResponse(self.club_info)
+
+    async def report(self, request: Request) -> Response:
+        await self._delay()
+        game_code = request.path_params["game"]
+        if not 1 <= game_code <= self.games:
+            return Response(status_code=404)
+        report = dict(self.game_report, gameCode=game_code, played=game_code <= self.played_games)
+        if not report["played"]:
+            report["local"] = dict(report["local"], score=0, standingsScore=0)
+            report["road"] = dict(report["road"], score=0, standingsScore=0)
+        return JSONResponse(report)
+
+    async def player_traditional(self, request: Request) -> Response:
+        await self._delay()
+        offset, limit = _int_param(request, "Offset", 0), _int_param(request, "Limit", 10)
+        return JSONResponse({"total": len(self.leaderboard), "players": self.leaderboard[offset:offset + limit]})
+
+    async def stats(self, request: Request) -> Response:
+        return JSONResponse({"requests": self.requests})
+
+    def app(self) -> Starlette:
+        return Starlette(routes=[
+            Route("/v3/clubs", self.clubs_listing),
+            Route("/v3/clubs/{code}", self.club),
+            Route("/v3/clubs/{code}/info", self.club_info_page),
+            Route("/v3/competitions/{competition}/seasons/{season}/games/{game:int}/report", self.report),
+            Route("/v3/competitions/{competition}/statistics/players/traditional", self.player_traditional),
+            Route("/_stats", self.stats),
+        ])
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="delay added to every upstream response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="maximum random delay added on top")
+    parser.add_argument("--games", type=int, default=306, help="game codes above this return 404")
+    parser.add_argument("--played-games", type=int, default=200, help="game codes up to this are played")
+    parser.add_argument("--leaderboard-rows", type=int, default=350, help="rows of the traditional leaderboard")
+    args = parser.parse_args()
+    upstream = FakeUpstream(args.latency_ms, args.jitter_ms, args.games, args.played_games, args.leaderboard_rows)
+    uvicorn.run(upstream.app(), host=args.host, port=args.port, log_level="warning")
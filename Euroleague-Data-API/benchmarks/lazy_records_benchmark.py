@@ -0,0 +1,89 @@
+"""
+Compares eager objects with lazy records for a traditional stats response: time and memory to
+map the rows, and to execute a narrow and a full GraphQL selection over them.
+
+Run from the Euroleague-Data-API directory:
+
+    python benchmarks/lazy_records_benchmark.py --rows 1000
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import strawberry  # noqa: E402
+from structures import PlayerTraditionalResponse, PlayerTraditionalStatistics  # noqa: E402
+from mappers import mapper_for, lazy_mapper_for  # noqa: E402
+from mapper_benchmark import leaderboard_row  # noqa: E402
+
+NARROW_QUERY = "{ leaderboard { players { pointsScored player { name } } } }"
+FULL_QUERY = """{ leaderboard { total players {
+    playerRanking gamesPlayed gamesStarted minutesPlayed pointsScored
+    twoPointersMade twoPointersAttempted twoPointersPercentage
+    threePointersMade threePointersAttempted threePointersPercentage
+    freeThrowsMade freeThrowsAttempted freeThrowsPercentage
+    offensiveRebounds defensiveRebounds totalRebounds assists steals turnovers
+    blocks blocksAgainst foulsCommited foulsDrawn pir
+    player { code name age imageUrl team { code tvCodes name imageUrl } }
+} } }"""
+
+
+def build_schema(rows, mapper) -> strawberry.Schema:
+    @strawberry.type
+    class Query:
+        @strawberry.field
+        def leaderboard(self) -> PlayerTraditionalResponse:
+            return PlayerTraditionalResponse(total=len(rows), players=[mapper(row) for row in rows])
+
+    return strawberry.Schema(query=Query)
+
+
+def measure(fn, repeat: int):
+    """
+    Returns the best wall time in milliseconds and the peak traced allocation in KiB.
+    """
+    best = float("inf")
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best * 1000, peak / 1024
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rows = [leaderboard_row(rank) for rank in range(1, args.rows + 1)]
+    mappers = {
+        "eager": mapper_for(PlayerTraditionalStatistics),
+        "lazy": lazy_mapper_for(PlayerTraditionalStatistics),
+    }
+    print(f"{args.rows} rows, best of {args.repeat}")
+    print(f"  {'':<28} {'eager ms':>10} {'eager KiB':>10} {'lazy ms':>10} {'lazy KiB':>10}")
+
+    cases = {"map rows": None, "narrow selection": NARROW_QUERY, "full selection": FULL_QUERY}
+    for case, query in cases.items():
+        numbers = []
+        for mapper in mappers.values():
+            if query is None:
+                numbers.extend(measure(lambda: [mapper(row) for row in rows], args.repeat))
+            else:
+                schema = build_schema(rows, mapper)
+                numbers.extend(measure(lambda: schema.execute_sync(query), args.repeat))
+        print(f"  {case:<28} {numbers[0]:>10.2f} {numbers[1]:>10.0f} {numbers[2]:>10.2f} {numbers[3]:>10.0f}")
@@ -0,0 +1,111 @@
+"""
+Micro-benchmark of the compiled dict-to-Strawberry mappers on a full traditional stats leaderboard page.
+
+Run from the Euroleague-Data-API directory:
+
+    python benchmarks/mapper_benchmark.py --rows 350 --repeat 200
+"""
+import argparse
+import copy
+import gc
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from structures import Player, PlayerTeam, PlayerTraditionalStatistics  # noqa: E402
+from mappers import mapper_for  # noqa: E402
+from resolvers import map_player_traditional  # noqa: E402
+
+
+def leaderboard_row(rank: int) -> dict:
+    return {
+        "playerRanking": rank,
+        "player": {
+            "code": f"P{rank:05d}", "name": f"PLAYER, {rank}", "age": 20 + rank % 15,
+            "imageUrl": f"https://example.com/{rank}.png",
+            "team": {"code": "MAD", "tvCodes": "RMB", "name": "Real Madrid", "imageUrl": "https://example.com/mad.png"},
+        },
+        "gamesPlayed": 30, "gamesStarted": 20, "minutesPlayed": 24.5, "pointsScored": 12.3,
+        "twoPointersMade": 3.1, "twoPointersAttempted": 5.9, "twoPointersPercentage": "52.5%",
+        "threePointersMade": 1.2, "threePointersAttempted": 3.4, "threePointersPercentage": "35.3%",
+        "freeThrowsMade": 2.5, "freeThrowsAttempted": 3.1, "freeThrowsPercentage": "80.6%",
+        "offensiveRebounds": 1.1, "defensiveRebounds": 3.2, "totalRebounds": 4.3, "assists": 2.8,
+        "steals": 0.9, "turnovers": 1.4, "blocks": 0.3, "blocksAgainst": 0.2, "foulsCommited": 2.1,
+        "foulsDrawn": 2.6, "pir": 14.1,
+    }
+
+
+def hand_written(player_data: dict) -> PlayerTraditionalStatistics:
+    # The conversion resolvers.py used before the compiled mappers, kept as the baseline
+    return PlayerTraditionalStatistics(
+        playerRanking=player_data.get('playerRanking'),
+        player=Player(
+            code=player_data['player'].get('code'),
+            name=player_data['player'].get('name'),
+            age=player_data['player'].get('age'),
+            imageUrl=player_data['player'].get('imageUrl'),
+            team=PlayerTeam(**player_data['player']['team'])
+        ),
+        gamesPlayed=player_data.get('gamesPlayed'),
+        gamesStarted=player_data.get('gamesStarted'),
+        minutesPlayed=player_data.get('minutesPlayed'),
+        pointsScored=player_data.get('pointsScored'),
+        twoPointersMade=player_data.get('twoPointersMade'),
+        twoPointersAttempted=player_data.get('twoPointersAttempted'),
+        twoPointersPercentage=player_data.get('twoPointersPercentage'),
+        threePointersMade=player_data.get('threePointersMade'),
+        threePointersAttempted=player_data.get('threePointersAttempted'),
+        threePointersPercentage=player_data.get('threePointersPercentage'),
+        freeThrowsMade=player_data.get('freeThrowsMade'),
+        freeThrowsAttempted=player_data.get('freeThrowsAttempted'),
+        freeThrowsPercentage=player_data.get('freeThrowsPercentage'),
+        offensiveRebounds=player_data.get('offensiveRebounds'),
+        defensiveRebounds=player_data.get('defensiveRebounds'),
+        totalRebounds=player_data.get('totalRebounds'),
+        assists=player_data.get('assists'),
+        steals=player_data.get('steals'),
+        turnovers=player_data.get('turnovers'),
+        blocks=player_data.get('blocks'),
+        blocksAgainst=player_data.get('blocksAgainst'),
+        foulsCommited=player_data.get('foulsCommited'),
+        foulsDrawn=player_data.get('foulsDrawn'),
+        pir=player_data.get('pir')
+    )
+
+
+def rows_per_second(fn, rows, repeat: int) -> float:
+    # Best of `repeat` runs with the garbage collector off, like timeit
+    best = float("inf")
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn(rows)
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return len(rows) / best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=350)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rows = [leaderboard_row(rank) for rank in range(1, args.rows + 1)]
+    compiled = mapper_for(PlayerTraditionalStatistics)
+    page = {"total": len(rows), "players": rows}
+    assert [hand_written(row) for row in copy.deepcopy(rows)] == [compiled(row) for row in rows]
+
+    results = {
+        "hand-written": rows_per_second(lambda rs: [hand_written(row) for row in rs], rows, args.repeat),
+        "compiled mapper": rows_per_second(lambda rs: [compiled(row) for row in rs], rows, args.repeat),
+        "map_player_traditional (with derived metrics)": rows_per_second(
+            lambda rs: map_player_traditional(page), rows, args.repeat),
+    }
+    print(f"{args.rows} rows, best of {args.repeat}")
+    for name, rate in results.items():
+        print(f"  {name:<48} {rate:>12,.0f} rows/s")
@@ -0,0 +1,47 @@
+"""
+Records the responses in benchmarks/fixtures from the real Euroleague API, which
+benchmarks/fake_upstream.py serves. The fixtures shipped with the repository are hand-built
+samples; run this to benchmark on real payloads, or when the upstream's response shapes change.
+
+Run from the Euroleague-Data-API directory:
+
+    python benchmarks/record_fixtures.py --season 2024 --club MAD --game 1
+"""
+import argparse
+import json
+import os
+import sys
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utilities import EUROLEAGUE_API_URL_V3  # noqa: E402
+from fake_upstream import FIXTURES_DIR  # noqa: E402
+
+
+def record(client: httpx.Client, name: str, endpoint: str, params: dict = None) -> None:
+    response = client.get(f"{EUROLEAGUE_API_URL_V3}/{endpoint}", params=params)
+    response.raise_for_status()
+    with open(os.path.join(FIXTURES_DIR, f"{name}.json"), "w", encoding="utf-8") as file:
+        json.dump(response.json(), file, indent=1, ensure_ascii=False)
+    print(f"  {name:<20} {endpoint} ({len(response.content):,} bytes)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--competition", default="E")
+    parser.add_argument("--season", type=int, default=2024)
+    parser.add_argument("--club", default="MAD", help="club whose info page is recorded")
+    parser.add_argument("--game", type=int, default=1, help="played game whose report is recorded")
+    parser.add_argument("--players", type=int, default=50, help="leaderboard rows recorded")
+    args = parser.parse_args()
+
+    competition, season_code = args.competition, f"{args.competition}{args.season}"
+    print(f"Recording fixtures from {EUROLEAGUE_API_URL_V3}")
+    with httpx.Client(timeout=30) as client:
+        record(client, "clubs", "clubs", {"Offset": 0, "Limit": 1000})
+        record(client, "club_info", f"clubs/{args.club}/info")
+        record(client, "game_report", f"competitions/{competition}/seasons/{season_code}/games/{args.game}/report")
+        record(client, "player_traditional", f"competitions/{competition}/statistics/players/traditional",
+               {"SeasonCode": season_code, "Offset": 0, "Limit": args.players})
@@ -0,0 +1,332 @@
+"""
+Benchmark suite run against benchmarks/fake_upstream.py instead of the real Euroleague API.
+
+Measures, with the upstream's latency under your control:
+  - mapping cost per leaderboard row for the compiled, lazy and derived-metrics mappers;
+  - in-process resolver throughput, executing each scenario's query on the schema with warm
+    upstream caches, so the numbers cover resolvers, mapping and GraphQL execution;
+  - end-to-end requests per second and p50/p90/p99 latency through the uvicorn app in main.py,
+    once with its caches as configured ('cached') and once with every cache of upstream data
+    disabled ('uncached'): the result, response, leaderboard and persistent caches, the local
+    store, and club lookups from the club index. Every request then reaches the fake upstream,
+    though identical requests in flight at the same time still share one upstream call.
+
+Results are written as JSON so runs can be compared, e.g. before and after a change.
+
+Run from the Euroleague-Data-API directory:
+
+    python benchmarks/run_benchmarks.py --latency-ms 40 --requests 500 --concurrency 16
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/<earlier run>.json
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+API_DIR = os.path.dirname(BENCHMARKS_DIR)
+RESULTS_DIR = os.path.join(BENCHMARKS_DIR, "results")
+sys.path.insert(0, API_DIR)
+sys.path.insert(0, BENCHMARKS_DIR)
+
+SCENARIOS = {
+    "clubs": "{ clubs(limit: 10) { code name city country { name } } }",
+    "clubByCode": "{ clubByCode(clubCode: MAD) { code name venue { name capacity } } }",
+    "clubInfo": "{ clubInfo(clubCode: MAD) }",
+    "gameReport": "{ gameReport(competitionCode: E, year: 2024, gameCode: 1) { gameCode played local { score club { name } } road { score club { name } } } }",
+    "gameReports": "{ gameReports(competitionCode: E, year: 2024, gameCodeRange: {start: 1, end: 50}) { gameCode error report { played local { score } road { score } } } }",
+    "playerTraditional": "{ playerTraditional(competitionCode: E, seasonCode: 2024, limit: 50) { total players { playerRanking pointsScored pir player { name team { code } } derivedMetrics { trueShootingPercentage pirPer36 } } } }",
+}
+# Environment of the API server in the 'uncached' end-to-end mode: no result, response,
+# leaderboard or persistent cache, no local store, and clubs/clubByCode not answered from the club index
+UNCACHED_ENV = {
+    "EUROLEAGUE_RESULT_CACHE_MAX_ENTRIES": "0",
+    "EUROLEAGUE_CACHE_MAX_ENTRIES": "0",
+    "EUROLEAGUE_LEADERBOARD_CACHE_SIZE": "0",
+    "EUROLEAGUE_SERVE_CLUBS_FROM_INDEX": "0",
+    "EUROLEAGUE_PERSISTENT_CACHE_PATH": "",
+    "EUROLEAGUE_LOCAL_STORE_PATH": "",
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    # Nearest-rank percentile of an ascending list
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies: List[float], elapsed: float, errors: int) -> Dict[str, float]:
+    """
+    Returns the throughput and latency percentiles, in milliseconds, of one measured run.
+    """
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "requests_per_second": round(len(latencies) / elapsed, 1) if elapsed > 0 else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p90_ms": round(percentile(latencies, 0.90) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+    }
+
+
+async def run_load(call, requests: int, concurrency: int) -> Dict[str, float]:
+    """
+    Awaits `call()` `requests` times from `concurrency` workers.
+
+    Args:
+        call: A coroutine function returning True on success.
+        requests (int): The number of calls measured.
+        concurrency (int): The number of calls in flight at once.
+    """
+    latencies: List[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            ok = await call()
+            latencies.append(time.perf_counter() - start)
+            if not ok:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - start, errors)
+
+
+class Process:
+    """
+    A subprocess that serves HTTP, started and stopped around a benchmark.
+    """
+
+    def __init__(self, name: str, args: List[str], port: int, probe: str, env: Optional[Dict[str, str]] = None):
+        self.name = name
+        self.args = args
+        self.port = port
+        self.probe = probe
+        self.env = env
+        self.process: Optional[subprocess.Popen] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self) -> "Process":
+        self.process = subprocess.Popen(self.args, cwd=API_DIR, env={**os.environ, **(self.env or {})})
+        deadline = time.monotonic() + 60
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"{self.name} exited with code {self.process.returncode}")
+            try:
+                if httpx.get(f"{self.url}{self.probe}", timeout=1).status_code == 200:
+                    return self
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.1)
+        self.__exit__(None, None, None)
+        raise RuntimeError(f"{self.name} did not become ready on port {self.port}")
+
+    def __exit__(self, *exc_info) -> None:
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+def fake_upstream(args: argparse.Namespace) -> Process:
+    port = free_port()
+    return Process("fake upstream", [
+        sys.executable, os.path.join(BENCHMARKS_DIR, "fake_upstream.py"), "--port", str(port),
+        "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms),
+        "--games", str(args.games), "--played-games", str(args.played_games),
+        "--leaderboard-rows", str(args.rows),
+    ], port, "/_stats")
+
+
+def api_server(upstream_url: str, env: Optional[Dict[str, str]] = None) -> Process:
+    port = free_port()
+    return Process("API server", [
+        sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+        "--log-level", "warning",
+    ], port, "/ready", {"EUROLEAGUE_API_BASE_URL": upstream_url, "EUROLEAGUE_WARMUP": "0", **(env or {})})
+
+
+def bench_mapping(args: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    from fake_upstream import FakeUpstream
+    from mapper_benchmark import rows_per_second
+    from mappers import lazy_mapper_for, mapper_for
+    from resolvers import map_player_traditional
+    from structures import PlayerTraditionalStatistics
+
+    rows = FakeUpstream(leaderboard_rows=args.rows).leaderboard
+    page = {"total": len(rows), "players": rows}
+    compiled = mapper_for(PlayerTraditionalStatistics)
+    lazy = lazy_mapper_for(PlayerTraditionalStatistics)
+    rates = {
+        "compiled": rows_per_second(lambda rs: [compiled(row) for row in rs], rows, args.repeat),
+        "lazy": rows_per_second(lambda rs: [lazy(row) for row in rs], rows, args.repeat),
+        "map_player_traditional": rows_per_second(lambda rs: map_player_traditional(page), rows, args.repeat),
+        "map_player_traditional_without_derived": rows_per_second(
+            lambda rs: map_player_traditional(page, derived_metrics=False), rows, args.repeat),
+    }
+    return {name: {"rows_per_second": round(rate), "us_per_row": round(1e6 / rate, 3)} for name, rate in rates.items()}
+
+
+async def bench_resolvers(args: argparse.Namespace, scenarios: Dict[str, str]) -> Dict[str, Dict[str, float]]:
+    # Imported here, after EUROLEAGUE_API_BASE_URL points at the fake upstream
+    from schema import schema
+    from utilities import close_async_client
+
+    results = {}
+    try:
+        for name, query in scenarios.items():
+            async def call(query=query) -> bool:
+                result = await schema.execute(query, context_value={})
+                return not result.errors
+
+            if not await call():
+                print(f"  warning: {name} returned errors")
+            results[name] = await run_load(call, args.requests, args.concurrency)
+    finally:
+        await close_async_client()
+    return results
+
+
+async def bench_http(url: str, args: argparse.Namespace, scenarios: Dict[str, str]) -> Dict[str, Dict[str, float]]:
+    results = {}
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        for name, query in scenarios.items():
+            async def call(query=query) -> bool:
+                response = await client.post("/graphql", json={"query": query})
+                return response.status_code == 200 and not response.json().get("errors")
+
+            if not await call():
+                print(f"  warning: {name} returned errors")
+            results[name] = await run_load(call, args.requests, args.concurrency)
+    return results
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=API_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def flatten(results: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    values = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            values.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            values[f"{prefix}{key}"] = value
+    return values
+
+
+def compare(previous: Dict[str, Any], current: Dict[str, Any]) -> None:
+    """
+    Prints every metric of two runs with its relative change.
+    """
+    before = flatten({key: previous.get(key, {}) for key in ("mapping", "resolvers", "http")})
+    after = flatten({key: current.get(key, {}) for key in ("mapping", "resolvers", "http")})
+    print(f"\nCompared with {previous['meta'].get('commit')} at {previous['meta'].get('timestamp')}")
+    for key, value in after.items():
+        if key.endswith((".requests", ".errors")) or key not in before:
+            continue
+        old = before[key]
+        change = f"{(value - old) / old * 100:+.1f}%" if old else "n/a"
+        print(f"  {key:<64} {old:>12,.3f} {value:>12,.3f} {change:>8}")
+
+
+def print_table(title: str, results: Dict[str, Dict[str, float]], columns: List[str]) -> None:
+    print(f"\n{title}")
+    print(f"  {'':<40}" + "".join(f"{column:>22}" for column in columns))
+    for name, values in results.items():
+        print(f"  {name:<40}" + "".join(f"{values[column]:>22,.3f}" for column in columns))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="fake upstream delay per response")
+    parser.add_argument("--jitter-ms", type=float, default=5.0, help="maximum random delay added on top")
+    parser.add_argument("--games", type=int, default=306, help="games in the fake season")
+    parser.add_argument("--played-games", type=int, default=200, help="games already played")
+    parser.add_argument("--rows", type=int, default=350, help="rows of the fake leaderboard and of the mapping benchmark")
+    parser.add_argument("--repeat", type=int, default=50, help="mapping runs; the best is kept")
+    parser.add_argument("--requests", type=int, default=300, help="requests measured per scenario")
+    parser.add_argument("--concurrency", type=int, default=8, help="requests in flight at once")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated scenarios to run")
+    parser.add_argument("--modes", default="cached,uncached", help="end-to-end modes: cached, uncached or both")
+    parser.add_argument("--skip", default="", help="comma-separated sections to skip: mapping, resolvers, http")
+    parser.add_argument("--output", help="result file, by default benchmarks/results/<timestamp>.json")
+    parser.add_argument("--compare", help="an earlier result file to compare with")
+    args = parser.parse_args()
+
+    scenarios = {name: SCENARIOS[name] for name in args.scenarios.split(",") if name}
+    skip = set(filter(None, args.skip.split(",")))
+    timestamp = datetime.datetime.now(datetime.timezone.utc)
+    results: Dict[str, Any] = {"meta": {
+        "timestamp": timestamp.isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "args": vars(args),
+    }}
+
+    with fake_upstream(args) as upstream:
+        os.environ["EUROLEAGUE_API_BASE_URL"] = upstream.url
+        os.environ["EUROLEAGUE_WARMUP"] = "0"
+        if "mapping" not in skip:
+            results["mapping"] = bench_mapping(args)
+            print_table(f"Mapping, {args.rows} rows, best of {args.repeat}", results["mapping"],
+                        ["rows_per_second", "us_per_row"])
+        columns = ["requests_per_second", "p50_ms", "p90_ms", "p99_ms", "errors"]
+        if "resolvers" not in skip:
+            results["resolvers"] = asyncio.run(bench_resolvers(args, scenarios))
+            print_table(f"Resolvers in-process, concurrency {args.concurrency}", results["resolvers"], columns)
+        if "http" not in skip:
+            results["http"] = {}
+            for mode in filter(None, args.modes.split(",")):
+                with api_server(upstream.url, UNCACHED_ENV if mode == "uncached" else None) as server:
+                    results["http"][mode] = asyncio.run(bench_http(server.url, args, scenarios))
+                print_table(f"HTTP {mode}, upstream latency {args.latency_ms}+{args.jitter_ms} ms, "
+                            f"concurrency {args.concurrency}", results["http"][mode], columns)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{timestamp:%Y%m%dT%H%M%SZ}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            compare(json.load(file), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+from urllib.parse import urlencode
+
+# Cache bounds, overridable through the environment
+CACHE_MAX_ENTRIES = int(os.environ.get("EUROLEAGUE_CACHE_MAX_ENTRIES", 5000))
+CACHE_MAX_BYTES = int(os.environ.get("EUROLEAGUE_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+# Per-endpoint TTLs in seconds. None means the entry never expires.
+CLUB_TTL = float(os.environ.get("EUROLEAGUE_CLUB_TTL", 24 * 60 * 60))
+UNPLAYED_GAME_TTL = float(os.environ.get("EUROLEAGUE_UNPLAYED_GAME_TTL", 15))
+LEADERBOARD_TTL = float(os.environ.get("EUROLEAGUE_LEADERBOARD_TTL", 5 * 60))
+DEFAULT_TTL = float(os.environ.get("EUROLEAGUE_DEFAULT_TTL", 60))
+# How long past its TTL a club, leaderboard or game report entry may still be served while it is refreshed
+STALE_WHILE_REVALIDATE = float(os.environ.get("EUROLEAGUE_STALE_WHILE_REVALIDATE", 60 * 60))
+
+_CLUB_ENDPOINT = re.compile(r"^clubs(/|$)")
+_GAME_REPORT_ENDPOINT = re.compile(r"^competitions/[^/]+/seasons/[^/]+/games/[^/]+/report$")
+_STATISTICS_ENDPOINT = re.compile(r"^competitions/[^/]+/statistics/")
+
+# Cleared in background refreshes, so a refresh never rebuilds data from stale entries
+serve_stale: ContextVar[bool] = ContextVar("serve_stale", default=True)
+
+
+class ResultLifetime:
+    """
+    Tracks how long the result of one GraphQL operation stays valid: the earliest expiry of
+    any data it was built from, capped at `max_ttl` seconds from now.
+    """
+
+    def __init__(self, max_ttl: float):
+        self.expires_at = time.time() + max_ttl
+
+    def limit(self, expires_at: Optional[float]) -> None:
+        # None means the data never expires
+        if expires_at is not None and expires_at < self.expires_at:
+            self.expires_at = expires_at
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.time())
+
+
+# Set per HTTP operation by the result cache; None outside of one and in background refreshes
+result_lifetime: ContextVar[Optional[ResultLifetime]] = ContextVar("result_lifetime", default=None)
+
+
+def limit_result_lifetime(expires_at: Optional[float]) -> None:
+    """
+    Records that the current operation read data valid until `expires_at` (None for never).
+    """
+    lifetime = result_lifetime.get()
+    if lifetime is not None:
+        lifetime.limit(expires_at)
+
+
+@dataclass
+class CacheEntry:
+    body: bytes
+    fetched_at: float
+    ttl: Optional[float]
+
+    @property
+    def expires_at(self) -> Optional[float]:
+        return None if self.ttl is None else self.fetched_at + self.ttl
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        return self.ttl is None or (now or time.time()) < self.fetched_at + self.ttl
+
+    def is_servable(self, stale_window: float, now: Optional[float] = None) -> bool:
+        return self.ttl is None or (now or time.time()) < self.fetched_at + self.ttl + stale_window
+
+
+def cache_key(endpoint: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Builds the cache key for an upstream request.
+
+    Args:
+        endpoint (str): The API endpoint (e.g., 'clubs/MAD').
+        params (Optional[Dict[str, Any]]): The query parameters left after None-stripping.
+
+    Returns:
+        str: The endpoint followed by the sorted, url-encoded params.
+    """
+    if not params:
+        return endpoint
+    return f"{endpoint}?{urlencode(sorted(params.items()))}"
+
+
+def ttl_for(endpoint: str, data: Dict[str, Any]) -> Optional[float]:
+    """
+    Returns the TTL policy for a decoded upstream response.
+
+    Args:
+        endpoint (str): The API endpoint the response came from.
+        data (Dict[str, Any]): The decoded JSON response.
+
+    Returns:
+        Optional[float]: The TTL in seconds, or None if the entry never expires.
+    """
+    if _CLUB_ENDPOINT.match(endpoint):
+        return CLUB_TTL
+    if _GAME_REPORT_ENDPOINT.match(endpoint):
+        # A finished game's report never changes
+        return None if data.get('played') else UNPLAYED_GAME_TTL
+    if _STATISTICS_ENDPOINT.match(endpoint):
+        return LEADERBOARD_TTL
+    return DEFAULT_TTL
+
+
+def stale_window_for(key: str) -> float:
+    """
+    Returns how long past expiry the entry for a cache key may be served stale.
+
+    Args:
+        key (str): The cache key, as built by cache_key.
+
+    Returns:
+        float: STALE_WHILE_REVALIDATE for club, game report and statistics endpoints, 0 otherwise.
+    """
+    endpoint = key.split("?", 1)[0]
+    if (_CLUB_ENDPOINT.match(endpoint) or _GAME_REPORT_ENDPOINT.match(endpoint)
+            or _STATISTICS_ENDPOINT.match(endpoint)):
+        return STALE_WHILE_REVALIDATE
+    return 0.0
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache of raw upstream response bodies, bounded by entry count and total bytes.
+
+    Bodies are stored undecoded so every hit hands out a fresh object that callers may mutate.
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, max_bytes: int = CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.stale_hits = 0
+
+    def get(self, key: str, stale_window: float = 0.0) -> Optional[CacheEntry]:
+        """
+        Returns the entry for a key, or None on a miss.
+
+        Args:
+            key (str): The cache key.
+            stale_window (float): How long past expiry the entry may still be returned. Callers
+                check `is_fresh()` on the result to decide whether to revalidate it.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            now = time.time()
+            if not entry.is_servable(stale_window, now):
+                # Keep entries another caller may still serve stale, e.g. the async path when the sync one misses
+                if not entry.is_servable(stale_window_for(key), now):
+                    self._remove(key)
+                    self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            if entry.is_fresh(now):
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+            return entry
+
+    def peek(self, key: str) -> Optional[CacheEntry]:
+        """
+        Returns the entry for a key, fresh or not, without counting a hit or touching the LRU order.
+        """
+        with self._lock:
+            return self._entries.get(key)
+
+    def set(self, key: str, body: bytes, ttl: Optional[float], fetched_at: Optional[float] = None) -> None:
+        """
+        Stores a response body, evicting least recently used entries to stay within bounds.
+        """
+        size = len(key) + len(body)
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = CacheEntry(body=body, fetched_at=fetched_at or time.time(), ttl=ttl)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the cache counters and current size.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "stale_hits": self.stale_hits,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= len(key) + len(entry.body)
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,180 @@
+import asyncio
+import base64
+import os
+import time
+import httpx
+from typing import Dict, List, Optional, Set, Tuple
+from enum_code import ClubCode
+from structures import Club, ClubConnection, ClubEdge, PageInfo
+from resolvers import map_club, map_clubs
+from cache import limit_result_lifetime, result_lifetime
+from utilities import AsyncSingleFlight, iter_pages_async
+
+# How often the index of all clubs is rebuilt from the upstream `clubs` listing
+CLUB_INDEX_REFRESH_INTERVAL = float(os.environ.get("EUROLEAGUE_CLUB_INDEX_REFRESH_INTERVAL", 15 * 60))
+CLUB_INDEX_PAGE_SIZE = int(os.environ.get("EUROLEAGUE_CLUB_INDEX_PAGE_SIZE", 500))
+CLUB_INDEX_PAGE_CONCURRENCY = int(os.environ.get("EUROLEAGUE_CLUB_INDEX_PAGE_CONCURRENCY", 4))
+# Set EUROLEAGUE_SERVE_CLUBS_FROM_INDEX=0 to send every `clubs` and `clubByCode` lookup upstream;
+# searchClubs and clubsConnection always use the index
+SERVE_CLUBS_FROM_INDEX = os.environ.get("EUROLEAGUE_SERVE_CLUBS_FROM_INDEX", "1") != "0"
+# Page size of clubsConnection when neither `first` nor `last` is given
+DEFAULT_CONNECTION_PAGE_SIZE = 10
+
+_CURSOR_PREFIX = "club:"
+
+# Club fields ClubCode can answer on its own (code -> name)
+ENUM_CLUB_FIELDS = frozenset({"code", "name", "__typename"})
+
+
+def enum_club(code: ClubCode) -> Club:
+    """
+    Builds a Club from the ClubCode enum, with only its code and name set.
+    """
+    return map_club({"code": code.name, "name": code.value})
+
+
+def encode_cursor(code: str) -> str:
+    return base64.b64encode(f"{_CURSOR_PREFIX}{code}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> str:
+    try:
+        decoded = base64.b64decode(cursor.encode(), validate=True).decode()
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    if not decoded.startswith(_CURSOR_PREFIX):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return decoded[len(_CURSOR_PREFIX):]
+
+
+class ClubIndex:
+    """
+    In-memory snapshot of every club from the upstream `clubs` listing, mapped once.
+
+    Cursors encode the club code rather than a position, so pages stay stable when the
+    listing changes between refreshes. A stale snapshot is served while it is refreshed
+    in the background; only the very first load makes a caller wait.
+    """
+
+    def __init__(self, refresh_interval: float = CLUB_INDEX_REFRESH_INTERVAL):
+        self.refresh_interval = refresh_interval
+        self.clubs: List[Club] = []
+        self.positions: Dict[str, int] = {}
+        self.loaded_at: Optional[float] = None
+        self._flights = AsyncSingleFlight()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.loaded_at is not None
+
+    def is_stale(self) -> bool:
+        return self.loaded_at is None or time.time() - self.loaded_at >= self.refresh_interval
+
+    async def ensure_loaded(self, wait: bool = True) -> None:
+        """
+        Loads the index on first use and schedules a background refresh when it is stale.
+
+        Args:
+            wait (bool): Whether to wait for the first load. Callers that can answer without
+                the index (e.g. from enum seeds) pass False to only start it.
+        """
+        if not self.is_loaded and wait:
+            await self.refresh()
+        elif self.is_stale():
+            asyncio.ensure_future(self._refresh_quietly())
+        if self.is_loaded:
+            # Answers built from the snapshot are valid until it is due for a refresh
+            limit_result_lifetime(self.loaded_at + self.refresh_interval)
+        else:
+            # Answers from the enum seeds lack most fields and must not outlive the first load
+            limit_result_lifetime(time.time())
+
+    async def refresh(self) -> None:
+        """
+        Rebuilds the index. Concurrent refreshes share one upstream crawl.
+        """
+        await self._flights.do("refresh", self._load)
+
+    async def _refresh_quietly(self) -> None:
+        result_lifetime.set(None)
+        try:
+            await self.refresh()
+        except (httpx.HTTPError, ValueError) as e:
+            print(f"Error while refreshing the club index: {e}")
+
+    async def _load(self) -> None:
+        clubs: List[Club] = []
+        async for page in iter_pages_async("clubs", {}, CLUB_INDEX_PAGE_SIZE, CLUB_INDEX_PAGE_CONCURRENCY):
+            clubs.extend(map_clubs(page))
+        self.clubs = clubs
+        self.positions = {club.code: i for i, club in enumerate(clubs)}
+        self.loaded_at = time.time()
+
+    def get(self, code: str) -> Optional[Club]:
+        i = self.positions.get(code)
+        return None if i is None else self.clubs[i]
+
+    def local_club(self, code: ClubCode, fields: Set[str]) -> Optional[Club]:
+        """
+        Answers a club lookup without the network when possible.
+
+        Args:
+            code (ClubCode): The requested club.
+            fields (Set[str]): The GraphQL fields selected on the club.
+
+        Returns:
+            Optional[Club]: The club from the index snapshot, a code-and-name club from the enum
+            when nothing else is selected, or None if the upstream API is needed.
+        """
+        club = self.get(code.name)
+        if club is None and fields <= ENUM_CLUB_FIELDS:
+            club = enum_club(code)
+        return club
+
+    def slice(self, first: Optional[int] = None, after: Optional[str] = None,
+              last: Optional[int] = None, before: Optional[str] = None) -> Tuple[int, int]:
+        """
+        Resolves Relay connection arguments to a [start, end) range of the index.
+        """
+        if (first is not None and first < 0) or (last is not None and last < 0):
+            raise ValueError("first and last must not be negative")
+        start, end = 0, len(self.clubs)
+        if after is not None:
+            start = self._position(after) + 1
+        if before is not None:
+            end = max(start, self._position(before))
+        if first is None and last is None:
+            first = DEFAULT_CONNECTION_PAGE_SIZE
+        if first is not None:
+            end = min(end, start + first)
+        if last is not None:
+            start = max(start, end - last)
+        return start, end
+
+    async def connection(self, first: Optional[int] = None, after: Optional[str] = None,
+                         last: Optional[int] = None, before: Optional[str] = None) -> ClubConnection:
+        """
+        Returns one Relay connection page, sliced from the in-memory index.
+        """
+        await self.ensure_loaded()
+        start, end = self.slice(first, after, last, before)
+        edges = [ClubEdge(cursor=encode_cursor(club.code), node=club) for club in self.clubs[start:end]]
+        return ClubConnection(
+            edges=edges,
+            pageInfo=PageInfo(
+                hasNextPage=end < len(self.clubs),
+                hasPreviousPage=start > 0,
+                startCursor=edges[0].cursor if edges else None,
+                endCursor=edges[-1].cursor if edges else None
+            ),
+            totalCount=len(self.clubs)
+        )
+
+    def _position(self, cursor: str) -> int:
+        position = self.positions.get(decode_cursor(cursor))
+        if position is None:
+            raise ValueError(f"Unknown cursor: {cursor}")
+        return position
+
+
+club_index = ClubIndex()
@@ -0,0 +1,165 @@
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+from enum_code import ClubCode
+from structures import Club
+from club_index import ClubIndex, club_index, enum_club
+
+# Maximum number of results searchClubs returns when no limit is given
+DEFAULT_SEARCH_LIMIT = 10
+# Minimum share of the query's trigrams a field must contain to count as a fuzzy match
+MIN_TRIGRAM_SIMILARITY = 0.3
+
+# Relative weight of a match in each searchable field
+FIELD_WEIGHTS: Dict[str, float] = {
+    "code": 4.0,
+    "name": 3.0,
+    "alias": 3.0,
+    "city": 2.0,
+    "country": 1.0,
+}
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize(text: Optional[str]) -> str:
+    """
+    Lowercases text, strips accents and collapses punctuation to single spaces.
+    """
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", text)
+    ascii_text = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return _NON_ALNUM.sub(" ", ascii_text.lower()).strip()
+
+
+def trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class ClubSearchIndex:
+    """
+    In-memory prefix and trigram index over club code, name, alias, city and country.
+
+    Every token prefix maps to the clubs containing it, so autocomplete queries are a few
+    dictionary lookups. Queries with no prefix match (typos, infixes) fall back to trigram
+    similarity. The index is seeded from `ClubCode` and rebuilt from the club index
+    whenever that has been refreshed.
+    """
+
+    def __init__(self, source: ClubIndex = club_index):
+        self.source = source
+        self.clubs: List[Club] = []
+        self.fields: List[Dict[str, str]] = []
+        self._prefixes: Dict[str, Dict[int, float]] = {}
+        self._trigrams: Dict[str, Set[Tuple[int, str]]] = {}
+        self._built_from: Optional[float] = None
+        self.build(self._merge([]))
+
+    @staticmethod
+    def _merge(listed: List[Club]) -> List[Club]:
+        clubs = {club.code: club for club in listed if club.code}
+        for code in ClubCode:
+            clubs.setdefault(code.name, enum_club(code))
+        return list(clubs.values())
+
+    def build(self, clubs: List[Club]) -> None:
+        """
+        Replaces the indexed clubs.
+        """
+        prefixes: Dict[str, Dict[int, float]] = defaultdict(dict)
+        grams: Dict[str, Set[Tuple[int, str]]] = defaultdict(set)
+        fields = []
+        for doc, club in enumerate(clubs):
+            values = {
+                "code": normalize(club.code),
+                "name": normalize(club.name),
+                "alias": normalize(club.alias),
+                "city": normalize(club.city),
+                "country": normalize(club.country.name if club.country else None),
+            }
+            fields.append(values)
+            for field, value in values.items():
+                weight = FIELD_WEIGHTS[field]
+                for position, token in enumerate(value.split()):
+                    # Matches on the first word of a field rank above later words
+                    token_weight = weight if position == 0 else weight * 0.75
+                    for end in range(1, len(token) + 1):
+                        postings = prefixes[token[:end]]
+                        if postings.get(doc, 0.0) < token_weight:
+                            postings[doc] = token_weight
+                for gram in trigrams(value) if value else ():
+                    grams[gram].add((doc, field))
+        self.clubs = clubs
+        self.fields = fields
+        self._prefixes = dict(prefixes)
+        self._trigrams = dict(grams)
+
+    def _refresh_from_source(self) -> None:
+        if self.source.loaded_at is not None and self.source.loaded_at != self._built_from:
+            self.build(self._merge(self.source.clubs))
+            self._built_from = self.source.loaded_at
+
+    def search(self, query: str, limit: Optional[int] = DEFAULT_SEARCH_LIMIT) -> List[Club]:
+        """
+        Returns the clubs best matching a query, best match first.
+
+        Every query token must be a prefix of a token in some field. Exact code and name
+        matches rank first. If nothing matches by prefix, clubs are ranked by trigram similarity.
+
+        Args:
+            query (str): The search text, e.g. "real ma" or "olymp".
+            limit (Optional[int]): The maximum number of clubs to return.
+
+        Returns:
+            List[Club]: The matching clubs.
+        """
+        self._refresh_from_source()
+        normalized = normalize(query)
+        if not normalized or (limit is not None and limit <= 0):
+            return []
+
+        scores = self._prefix_scores(normalized.split())
+        if not scores:
+            scores = self._trigram_scores(normalized)
+
+        for doc in scores:
+            values = self.fields[doc]
+            if values["code"] == normalized:
+                scores[doc] += 100.0
+            elif values["name"] == normalized or values["alias"] == normalized:
+                scores[doc] += 50.0
+        ranked = sorted(scores, key=lambda doc: (-scores[doc], self.fields[doc]["name"]))
+        return [self.clubs[doc] for doc in ranked[:limit]]
+
+    def _prefix_scores(self, tokens: List[str]) -> Dict[int, float]:
+        scores: Optional[Dict[int, float]] = None
+        for token in tokens:
+            postings = self._prefixes.get(token)
+            if not postings:
+                return {}
+            if scores is None:
+                scores = dict(postings)
+            else:
+                scores = {doc: score + postings[doc] for doc, score in scores.items() if doc in postings}
+                if not scores:
+                    return {}
+        return scores or {}
+
+    def _trigram_scores(self, normalized: str) -> Dict[int, float]:
+        query_grams = trigrams(normalized)
+        shared: Dict[Tuple[int, str], int] = defaultdict(int)
+        for gram in query_grams:
+            for posting in self._trigrams.get(gram, ()):
+                shared[posting] += 1
+        scores: Dict[int, float] = {}
+        for (doc, field), count in shared.items():
+            similarity = count / len(query_grams)
+            if similarity >= MIN_TRIGRAM_SIMILARITY:
+                scores[doc] = max(scores.get(doc, 0.0), similarity * FIELD_WEIGHTS[field])
+        return scores
+
+
+club_search_index = ClubSearchIndex()
@@ -0,0 +1,178 @@
+import asyncio
+import math
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from graphql import (ExecutionResult, FieldNode, FragmentSpreadNode, GraphQLError, InlineFragmentNode,
+                     OperationDefinitionNode, OperationType, get_operation_ast)
+from graphql.execution.values import get_argument_values, get_variable_values
+from strawberry.extensions import SchemaExtension
+from leaderboard import LEADERBOARD_PAGE_SIZE
+from resolvers import MAX_GAME_REPORTS
+
+# Operations estimated above either budget are rejected before execution. By default the request
+# budget fits the largest gameReports batch (a full season) with room for a few other root fields.
+MAX_QUERY_UPSTREAM_REQUESTS = int(os.environ.get("EUROLEAGUE_MAX_QUERY_UPSTREAM_REQUESTS", MAX_GAME_REPORTS + 50))
+MAX_QUERY_ROWS = int(os.environ.get("EUROLEAGUE_MAX_QUERY_ROWS", 10000))
+# Operations above this many upstream requests wait for one of EXPENSIVE_QUERY_CONCURRENCY slots
+THROTTLE_QUERY_UPSTREAM_REQUESTS = int(os.environ.get("EUROLEAGUE_THROTTLE_QUERY_UPSTREAM_REQUESTS", 50))
+EXPENSIVE_QUERY_CONCURRENCY = int(os.environ.get("EUROLEAGUE_EXPENSIVE_QUERY_CONCURRENCY", 2))
+# Assumed size of a full traditional stats leaderboard, used to estimate its page requests
+LEADERBOARD_ESTIMATED_ROWS = int(os.environ.get("EUROLEAGUE_LEADERBOARD_ESTIMATED_ROWS", 400))
+
+_expensive_slots: Optional[asyncio.Semaphore] = None
+
+
+@dataclass
+class QueryCost:
+    upstream_requests: int = 0
+    rows: int = 0
+
+    def add(self, requests: int, rows: int) -> None:
+        self.upstream_requests += requests
+        self.rows += rows
+
+    def as_dict(self) -> Dict[str, int]:
+        return {"upstreamRequests": self.upstream_requests, "rows": self.rows}
+
+
+def _get(value: Any, name: str) -> Any:
+    # Coerced input objects are dicts, or instances when the schema maps them to a type
+    return value.get(name) if isinstance(value, dict) else getattr(value, name, None)
+
+
+def _game_reports_cost(args: Dict[str, Any]) -> Tuple[int, int]:
+    codes = args.get("gameCodes")
+    if codes is None:
+        game_code_range = args.get("gameCodeRange")
+        if game_code_range is None:
+            return 0, 0
+        count = max(0, _get(game_code_range, "end") - _get(game_code_range, "start") + 1)
+    else:
+        count = len(codes)
+    return count, count
+
+
+def _player_traditional_cost(args: Dict[str, Any]) -> Tuple[int, int]:
+    limit = args.get("limit")
+    all_rows = args.get("allRows")
+    if args.get("statisticSortMode") is not None and not all_rows:
+        # Paged by the upstream API: one request, `limit` rows
+        return 1, limit if limit is not None else LEADERBOARD_ESTIMATED_ROWS
+    # The whole leaderboard is fetched, then paged locally
+    pages = math.ceil(LEADERBOARD_ESTIMATED_ROWS / LEADERBOARD_PAGE_SIZE)
+    rows = LEADERBOARD_ESTIMATED_ROWS if all_rows or limit is None else min(limit, LEADERBOARD_ESTIMATED_ROWS)
+    return pages, rows
+
+
+def _connection_rows(args: Dict[str, Any]) -> int:
+    first, last = args.get("first"), args.get("last")
+    return max(first or 0, last or 0) or 10
+
+
+# Estimated (upstream requests, result rows) per root field, from its arguments.
+# Root fields not listed here are assumed to be local and return one row.
+FIELD_COSTS: Dict[str, Callable[[Dict[str, Any]], Tuple[int, int]]] = {
+    "clubs": lambda args: (1, args.get("limit") or 0),
+    "clubsConnection": lambda args: (1, _connection_rows(args)),
+    "searchClubs": lambda args: (0, args.get("limit") or 0),
+    "clubByCode": lambda args: (1, 1),
+    "clubInfo": lambda args: (1, 1),
+    "gameReport": lambda args: (1, 1),
+    "gameReports": _game_reports_cost,
+    "playerTraditional": _player_traditional_cost,
+    "gameUpdates": lambda args: (1, 1),
+}
+
+
+def _root_fields(selections: Iterable[Any], fragments: Dict[str, Any]) -> Iterable[FieldNode]:
+    for selection in selections:
+        if isinstance(selection, FieldNode):
+            yield selection
+        elif isinstance(selection, InlineFragmentNode):
+            yield from _root_fields(selection.selection_set.selections, fragments)
+        elif isinstance(selection, FragmentSpreadNode) and selection.name.value in fragments:
+            yield from _root_fields(fragments[selection.name.value].selection_set.selections, fragments)
+
+
+def estimate_cost(schema: Any, document: Any, operation: OperationDefinitionNode,
+                  variables: Optional[Dict[str, Any]]) -> QueryCost:
+    """
+    Estimates the upstream fan-out and result size of an operation before it runs.
+
+    Every root field occurrence counts, so aliases of the same field add up. Arguments are
+    coerced with variables and defaults applied, the same way execution will see them.
+
+    Args:
+        schema (GraphQLSchema): The graphql-core schema.
+        document (DocumentNode): The parsed document.
+        operation (OperationDefinitionNode): The operation that will be executed.
+        variables (Optional[Dict[str, Any]]): The operation's variable values.
+
+    Returns:
+        QueryCost: The estimated upstream requests and result rows.
+    """
+    root_type = schema.get_root_type(operation.operation)
+    fragments = {definition.name.value: definition for definition in document.definitions
+                 if definition.kind == "fragment_definition"}
+    cost = QueryCost()
+    variable_values = get_variable_values(schema, operation.variable_definitions or (), variables or {})
+    if isinstance(variable_values, list):
+        # Invalid variables: execution reports the errors without reaching any resolver
+        return cost
+    for node in _root_fields(operation.selection_set.selections, fragments):
+        field_def = root_type.fields.get(node.name.value) if root_type else None
+        estimate = FIELD_COSTS.get(node.name.value)
+        if field_def is None or estimate is None:
+            cost.add(0, 1)
+            continue
+        cost.add(*estimate(get_argument_values(field_def, node, variable_values)))
+    return cost
+
+
+class QueryCostExtension(SchemaExtension):
+    """
+    Rejects or throttles operations by their estimated cost, and reports it in `extensions.cost`.
+
+    Operations above MAX_QUERY_UPSTREAM_REQUESTS or MAX_QUERY_ROWS fail before any resolver
+    runs. Operations above THROTTLE_QUERY_UPSTREAM_REQUESTS run, but at most
+    EXPENSIVE_QUERY_CONCURRENCY of them at a time.
+    """
+
+    def __init__(self, *, execution_context=None):
+        super().__init__(execution_context=execution_context)
+        self.cost: Optional[QueryCost] = None
+        self.throttled = False
+
+    async def on_execute(self):
+        global _expensive_slots
+        context = self.execution_context
+        operation = get_operation_ast(context.graphql_document, context.operation_name)
+        if operation is None or operation.operation == OperationType.SUBSCRIPTION:
+            yield
+            return
+
+        self.cost = estimate_cost(context.schema._schema, context.graphql_document, operation, context.variables)
+        if self.cost.upstream_requests > MAX_QUERY_UPSTREAM_REQUESTS or self.cost.rows > MAX_QUERY_ROWS:
+            context.result = ExecutionResult(data=None, errors=[GraphQLError(
+                f"Query is too expensive: {self.cost.upstream_requests} upstream requests and "
+                f"{self.cost.rows} rows estimated, the limits are {MAX_QUERY_UPSTREAM_REQUESTS} "
+                f"and {MAX_QUERY_ROWS}",
+                extensions={"code": "QUERY_TOO_EXPENSIVE", "cost": self.cost.as_dict()},
+            )])
+            yield
+            return
+
+        if self.cost.upstream_requests <= THROTTLE_QUERY_UPSTREAM_REQUESTS:
+            yield
+            return
+        if _expensive_slots is None:
+            _expensive_slots = asyncio.Semaphore(EXPENSIVE_QUERY_CONCURRENCY)
+        self.throttled = True
+        async with _expensive_slots:
+            yield
+
+    def get_results(self) -> Dict[str, Any]:
+        if self.cost is None:
+            return {}
+        return {"cost": {**self.cost.as_dict(), "throttled": self.throttled}}
@@ -0,0 +1,187 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+from graphql import DocumentNode, GraphQLError, parse
+from strawberry.extensions import SchemaExtension
+from strawberry.schema.schema import validate_document
+
+# Bounds of the parsed document cache, which also holds the registered persisted queries
+DOCUMENT_CACHE_MAX_ENTRIES = int(os.environ.get("EUROLEAGUE_DOCUMENT_CACHE_MAX_ENTRIES", 1000))
+DOCUMENT_CACHE_MAX_BYTES = int(os.environ.get("EUROLEAGUE_DOCUMENT_CACHE_MAX_BYTES", 8 * 1024 * 1024))
+
+
+@dataclass
+class CachedDocument:
+    query: str
+    document: DocumentNode
+    # None until the document has been validated once
+    validation_errors: Optional[List[GraphQLError]] = None
+
+
+def document_hash(query: str) -> str:
+    """
+    Returns the SHA-256 hex digest of a query text, as automatic persisted queries send it.
+    """
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+class DocumentCache:
+    """
+    Thread-safe LRU cache of parsed and validated GraphQL documents, keyed by the query's SHA-256.
+
+    Bounded by entry count and total query text size. Because entries are keyed the same way
+    as automatic persisted queries, the cache doubles as the persisted query store: a hash-only
+    request is answered from here or asks the client to register the query.
+    """
+
+    def __init__(self, max_entries: int = DOCUMENT_CACHE_MAX_ENTRIES, max_bytes: int = DOCUMENT_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CachedDocument]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.persisted_hits = 0
+        self.persisted_misses = 0
+
+    def get(self, key: str) -> Optional[CachedDocument]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key: str, query: str, document: DocumentNode) -> CachedDocument:
+        """
+        Stores a parsed document, evicting least recently used entries to stay within bounds.
+        """
+        entry = CachedDocument(query=query, document=document)
+        size = len(query)
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return entry
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+        return entry
+
+    def persisted_query(self, key: str) -> Optional[CachedDocument]:
+        """
+        Returns the entry registered for a persisted query hash, or None if it is unknown.
+        """
+        entry = self.get(key)
+        with self._lock:
+            if entry is None:
+                self.persisted_misses += 1
+            else:
+                self.persisted_hits += 1
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the cache counters and current size.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "persisted_hits": self.persisted_hits,
+                "persisted_misses": self.persisted_misses,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= len(entry.query)
+
+
+document_cache = DocumentCache()
+
+
+def _persisted_query_hash(operation_extensions: Optional[Dict[str, Any]]) -> Optional[str]:
+    persisted = (operation_extensions or {}).get("persistedQuery")
+    if not isinstance(persisted, dict):
+        return None
+    if persisted.get("version") != 1 or not isinstance(persisted.get("sha256Hash"), str):
+        raise GraphQLError("Unsupported persisted query version or hash",
+                           extensions={"code": "PERSISTED_QUERY_NOT_SUPPORTED"})
+    return persisted["sha256Hash"].lower()
+
+
+class DocumentCacheExtension(SchemaExtension):
+    """
+    Serves parsing and validation from `document_cache`, and implements automatic persisted queries.
+
+    A request carrying `extensions.persistedQuery.sha256Hash` without a query is answered
+    with the registered query, or fails with `PersistedQueryNotFound` so the client retries
+    with the full text. A request carrying both registers the query once its hash is checked.
+    """
+
+    def __init__(self, *, execution_context=None):
+        super().__init__(execution_context=execution_context)
+        self.key: Optional[str] = None
+        self.entry: Optional[CachedDocument] = None
+
+    def on_operation(self):
+        context = self.execution_context
+        persisted_hash = _persisted_query_hash(context.operation_extensions)
+        if persisted_hash is not None:
+            if context.query:
+                if document_hash(context.query) != persisted_hash:
+                    raise GraphQLError("Provided sha does not match query",
+                                       extensions={"code": "PERSISTED_QUERY_HASH_MISMATCH"})
+            else:
+                self.entry = document_cache.persisted_query(persisted_hash)
+                if self.entry is None:
+                    raise GraphQLError("PersistedQueryNotFound", extensions={"code": "PERSISTED_QUERY_NOT_FOUND"})
+                context.query = self.entry.query
+            self.key = persisted_hash
+        elif context.query:
+            self.key = document_hash(context.query)
+        yield
+
+    def on_parse(self):
+        context = self.execution_context
+        if self.key is not None and context.graphql_document is None:
+            if self.entry is None:
+                self.entry = document_cache.get(self.key)
+            if self.entry is None:
+                try:
+                    document = parse(context.query, **context.parse_options)
+                except GraphQLError:
+                    # Left to Strawberry, which reports syntax errors; invalid text is never cached
+                    document = None
+                if document is not None:
+                    self.entry = document_cache.set(self.key, context.query, document)
+            if self.entry is not None:
+                context.graphql_document = self.entry.document
+        yield
+
+    def on_validate(self):
+        context = self.execution_context
+        entry = self.entry
+        if entry is not None and context.graphql_document is entry.document and context.validation_rules:
+            if entry.validation_errors is None:
+                entry.validation_errors = validate_document(
+                    context.schema._schema, entry.document, context.validation_rules)
+            context.pre_execution_errors = entry.validation_errors
+        yield
@@ -0,0 +1,165 @@
+import argparse
+import asyncio
+import httpx
+from typing import Any, Dict
+from enum_code import CompetitionCode
+from local_store import LocalStore, LOCAL_STORE_PATH, GAME_REPORT_COLUMNS, PLAYER_TRADITIONAL_COLUMNS, flatten
+from resolvers import game_report_endpoint
+from utilities import fetch_euroleague_v3_async, gather_bounded, close_async_client
+
+# Page size used when crawling the traditional stats leaderboard
+LEADERBOARD_PAGE_SIZE = 100
+
+
+async def ingest_game_reports(store: LocalStore, competition_code: CompetitionCode, year: int,
+                              concurrency: int = 8, max_missing: int = 10, max_failures: int = 10) -> Dict[str, Any]:
+    """
+    Crawls a season's game reports into the local store.
+
+    Game codes are probed in ascending batches until `max_missing` consecutive codes are not
+    found. Played games already in the store are skipped, so re-running only fetches new and
+    unplayed games. The table is saved after every batch, which makes the crawl resumable.
+    The crawl is aborted after `max_failures` consecutive failed fetches, keeping what was saved.
+
+    Returns:
+        Dict[str, Any]: Counts of fetched, skipped and failed games, and under `aborted` the
+        reason the crawl was aborted, or None if it finished.
+    """
+    table = store.game_reports_table(competition_code.name, year)
+    stats: Dict[str, Any] = {"fetched": 0, "skipped": 0, "failed": 0, "aborted": None}
+    missing_streak = failure_streak = 0
+    game_code = 1
+    while missing_streak < max_missing:
+        batch = list(range(game_code, game_code + concurrency))
+        game_code += concurrency
+        to_fetch = []
+        for code in batch:
+            stored = table.get(code)
+            if stored is not None and stored.get("played"):
+                stats["skipped"] += 1
+            else:
+                to_fetch.append(code)
+        fetched = await gather_bounded(
+            [lambda code=code: fetch_euroleague_v3_async(game_report_endpoint(competition_code, year, code))
+             for code in to_fetch],
+            concurrency
+        )
+        results: Dict[int, Any] = dict(zip(to_fetch, fetched))
+
+        rows = []
+        for code in batch:
+            if code not in results:
+                # A stored played game exists, but says nothing about whether the upstream is healthy
+                missing_streak = 0
+                continue
+            data = results[code]
+            if isinstance(data, httpx.HTTPStatusError) and data.response.status_code == 404:
+                missing_streak += 1
+                failure_streak = 0
+                continue
+            if isinstance(data, BaseException) or not data:
+                # A failure says nothing about whether the game exists, so the missing streak is kept
+                stats["failed"] += 1
+                failure_streak += 1
+                print(f"Failed to fetch game {code}: {data!r}")
+                continue
+            missing_streak = failure_streak = 0
+            rows.append(flatten(data, GAME_REPORT_COLUMNS))
+        if rows:
+            table.upsert(rows)
+            stats["fetched"] += len(rows)
+            table.save()
+        if failure_streak >= max_failures:
+            stats["aborted"] = f"{failure_streak} consecutive failed fetches, stopped before game {game_code}"
+            print(f"Aborted the game report crawl after {stats['aborted']}; re-run to resume")
+            break
+    return stats
+
+
+async def ingest_player_traditional(store: LocalStore, competition_code: CompetitionCode, year: int,
+                                    concurrency: int = 8, refresh: bool = False) -> Dict[str, int]:
+    """
+    Crawls a season's default traditional stats leaderboard into the local store.
+
+    Progress is checkpointed after every batch of pages, so an interrupted crawl resumes at
+    the next missing offset. A completed leaderboard is only crawled again when `refresh` is set.
+
+    Returns:
+        Dict[str, int]: The leaderboard total and the number of stored rows.
+    """
+    table = store.player_traditional_table(competition_code.name, year)
+    if table.meta.get("complete") and not refresh:
+        return {"total": table.meta.get("total", len(table)), "rows": len(table)}
+    if table.meta.get("complete"):
+        table.truncate()
+        table.meta = {}
+
+    endpoint = f"competitions/{competition_code.name}/statistics/players/traditional"
+    params = {"SeasonCode": f"{competition_code.name}{year}", "Limit": LEADERBOARD_PAGE_SIZE}
+    total = table.meta.get("total")
+    if total is None:
+        first_page = await fetch_euroleague_v3_async(endpoint, {**params, "Offset": 0})
+        total = first_page.get("total") or 0
+        table.upsert(flatten(row, PLAYER_TRADITIONAL_COLUMNS) for row in first_page.get("players", []))
+        table.meta.update({"total": total, "next_offset": LEADERBOARD_PAGE_SIZE})
+        table.save()
+
+    offsets = list(range(table.meta["next_offset"], total, LEADERBOARD_PAGE_SIZE))
+    for start in range(0, len(offsets), concurrency):
+        batch = offsets[start:start + concurrency]
+        pages = await gather_bounded(
+            [lambda offset=offset: fetch_euroleague_v3_async(endpoint, {**params, "Offset": offset}) for offset in batch],
+            concurrency
+        )
+        failed = next((page for page in pages if isinstance(page, BaseException)), None)
+        if failed is not None:
+            # Keep the last checkpoint so the next run resumes from here
+            raise failed
+        for page in pages:
+            table.upsert(flatten(row, PLAYER_TRADITIONAL_COLUMNS) for row in page.get("players", []))
+        table.meta["next_offset"] = batch[-1] + LEADERBOARD_PAGE_SIZE
+        table.save()
+
+    table.meta["complete"] = True
+    table.save()
+    return {"total": total, "rows": len(table)}
+
+
+async def ingest_season(store: LocalStore, competition_code: CompetitionCode, year: int,
+                        concurrency: int = 8, max_missing: int = 10, max_failures: int = 10) -> Dict[str, Any]:
+    """
+    Ingests all game reports and the traditional stats leaderboard of one season.
+
+    The leaderboard is refreshed whenever new games were ingested, since its totals change with them.
+    It is left alone when the game report crawl was aborted, since the upstream is failing.
+    """
+    try:
+        games = await ingest_game_reports(store, competition_code, year, concurrency, max_missing, max_failures)
+        if games["aborted"]:
+            return {"game_reports": games, "player_traditional": None}
+        leaderboard = await ingest_player_traditional(store, competition_code, year, concurrency,
+                                                      refresh=games["fetched"] > 0)
+    finally:
+        await close_async_client()
+    return {"game_reports": games, "player_traditional": leaderboard}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest a Euroleague season into the local columnar store.")
+    parser.add_argument("--competition", choices=[code.name for code in CompetitionCode], default=CompetitionCode.E.name)
+    parser.add_argument("--year", type=int, required=True, help="The season year (YYYY).")
+    parser.add_argument("--store", default=LOCAL_STORE_PATH, help="The store root (defaults to EUROLEAGUE_LOCAL_STORE_PATH).")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--max-missing", type=int, default=10,
+                        help="Stop probing game codes after this many consecutive codes are not found.")
+    parser.add_argument("--max-failures", type=int, default=10,
+                        help="Abort after this many consecutive failed fetches, keeping what was saved.")
+    args = parser.parse_args()
+    if not args.store:
+        parser.error("--store or EUROLEAGUE_LOCAL_STORE_PATH is required")
+
+    summary = asyncio.run(ingest_season(LocalStore(args.store), CompetitionCode[args.competition], args.year,
+                                        args.concurrency, args.max_missing, args.max_failures))
+    print(summary)
+    if summary["game_reports"]["aborted"]:
+        raise SystemExit(1)
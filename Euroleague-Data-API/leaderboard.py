@@ -0,0 +1,184 @@
+import asyncio
+import os
+import time
+import httpx
+from collections import OrderedDict
+import numpy as np
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+from cache import LEADERBOARD_TTL, STALE_WHILE_REVALIDATE, serve_stale, result_lifetime, limit_result_lifetime
+from enum_code import Stats
+from player_metrics import PlayerStatsTable
+from utilities import AsyncSingleFlight, refresh_scheduler
+
+# Number of full leaderboards kept in memory
+LEADERBOARD_CACHE_SIZE = int(os.environ.get("EUROLEAGUE_LEADERBOARD_CACHE_SIZE", 32))
+# Page size and number of concurrent page requests used to fetch a full leaderboard
+LEADERBOARD_PAGE_SIZE = int(os.environ.get("EUROLEAGUE_LEADERBOARD_PAGE_SIZE", 100))
+LEADERBOARD_PAGE_CONCURRENCY = int(os.environ.get("EUROLEAGUE_LEADERBOARD_PAGE_CONCURRENCY", 8))
+
+# Stats that can be sorted locally, mapped to the leaderboard row field holding them.
+# Any other statistic is sorted by the upstream API.
+STAT_FIELDS: Dict[Stats, str] = {
+    Stats.Valuation: "pir",
+    Stats.Score: "pointsScored",
+    Stats.TotalRebounds: "totalRebounds",
+    Stats.OffensiveRebounds: "offensiveRebounds",
+    Stats.DefensiveRebounds: "defensiveRebounds",
+    Stats.Assistances: "assists",
+    Stats.Steals: "steals",
+    Stats.BlocksFavour: "blocks",
+    Stats.BlocksAgainst: "blocksAgainst",
+    Stats.Turnovers: "turnovers",
+    Stats.FoulsReceived: "foulsDrawn",
+    Stats.FoulsCommited: "foulsCommited",
+    Stats.FreeThrowsMade: "freeThrowsMade",
+    Stats.FreeThrowsAttempted: "freeThrowsAttempted",
+    Stats.FreeThrowsPercent: "freeThrowsPercentage",
+    Stats.FieldGoalsMade2: "twoPointersMade",
+    Stats.FieldGoalsAttempted2: "twoPointersAttempted",
+    Stats.FieldGoals2Percent: "twoPointersPercentage",
+    Stats.FieldGoalsMade3: "threePointersMade",
+    Stats.FieldGoalsAttempted3: "threePointersAttempted",
+    Stats.FieldGoals3Percent: "threePointersPercentage",
+    Stats.GamesPlayed: "gamesPlayed",
+    Stats.GamesStarted: "gamesStarted",
+    Stats.TimePlayed: "minutesPlayed",
+    Stats.Age: "age",
+}
+
+
+class Leaderboard:
+    """
+    A full traditional stats leaderboard held in memory, with NumPy columns for sorting and
+    filtering. Sort indexes are built on first use per (column, direction) and then reused.
+    """
+
+    def __init__(self, rows: List[Dict[str, Any]], total: int):
+        self.rows = rows
+        self.total = total
+        self.table = PlayerStatsTable.from_rows(rows)
+        players = [row.get('player') or {} for row in rows]
+        self.ages = np.array([player.get('age') for player in players], dtype=np.float64)
+        self.team_codes = np.array([(player.get('team') or {}).get('code') for player in players], dtype=object)
+        self._sort_indexes: Dict[Tuple[str, bool], np.ndarray] = {}
+
+    def column(self, field: str) -> np.ndarray:
+        return self.ages if field == "age" else self.table[field]
+
+    def sort_index(self, field: str, descending: bool) -> np.ndarray:
+        """
+        Returns row positions ordered by a column. Missing values sort last in both
+        directions and ties keep the upstream rank order.
+        """
+        key = (field, descending)
+        index = self._sort_indexes.get(key)
+        if index is None:
+            values = self.column(field)
+            index = np.argsort(-values if descending else values, kind="stable")
+            self._sort_indexes[key] = index
+        return index
+
+    def query(self,
+              statistic: Optional[Stats] = None,
+              descending: bool = True,
+              offset: Optional[int] = 0,
+              limit: Optional[int] = None,
+              min_games_played: Optional[float] = None,
+              team_code: Optional[str] = None,
+              min_age: Optional[int] = None,
+              max_age: Optional[int] = None) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Sorts, filters and pages the leaderboard locally.
+
+        Args:
+            statistic (Optional[Stats]): The stat to sort by (a key of STAT_FIELDS), or None for upstream order.
+            descending (bool): Whether to sort from highest to lowest.
+            offset (Optional[int]): The number of matching rows to skip.
+            limit (Optional[int]): The maximum number of rows to return.
+            min_games_played (Optional[float]): Keep players with at least this many games played.
+            team_code (Optional[str]): Keep players of this team.
+            min_age (Optional[int]): Keep players at least this old.
+            max_age (Optional[int]): Keep players at most this old.
+
+        Returns:
+            Tuple[int, List[Dict[str, Any]]]: The number of matching rows and the requested page of raw rows.
+        """
+        size = len(self.rows)
+        order = self.sort_index(STAT_FIELDS[statistic], descending) if statistic is not None else np.arange(size)
+
+        mask = np.ones(size, dtype=bool)
+        with np.errstate(invalid="ignore"):
+            if min_games_played is not None:
+                mask &= self.table["gamesPlayed"] >= min_games_played
+            if team_code is not None:
+                mask &= self.team_codes == team_code
+            if min_age is not None:
+                mask &= self.ages >= min_age
+            if max_age is not None:
+                mask &= self.ages <= max_age
+        selected = order[mask[order]]
+
+        start = offset or 0
+        end = start + limit if limit is not None else None
+        page = [self.rows[i] for i in selected[start:end].tolist()]
+        if statistic is not None:
+            # Ranks follow the local sort, like the upstream ranking follows its sort
+            page = [{**row, 'playerRanking': start + i + 1} for i, row in enumerate(page)]
+        return len(selected), page
+
+
+class LeaderboardCache:
+    """
+    LRU cache of full leaderboards with a TTL. Concurrent misses for the same key share one load.
+
+    An expired leaderboard is still served for up to `stale_window` seconds while it is
+    reloaded in the background; the reload is charged to the refresh scheduler's budget.
+    """
+
+    def __init__(self, max_entries: int = LEADERBOARD_CACHE_SIZE, ttl: float = LEADERBOARD_TTL,
+                 stale_window: float = STALE_WHILE_REVALIDATE):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_window = stale_window
+        self._entries: "OrderedDict[Hashable, Tuple[float, Leaderboard]]" = OrderedDict()
+        self._flights = AsyncSingleFlight()
+        self._reloading: Set[Hashable] = set()
+
+    async def get(self, key: Hashable, load: Callable[[], Awaitable[Leaderboard]]) -> Leaderboard:
+        cached = self._entries.get(key)
+        if cached is not None:
+            age = time.time() - cached[0]
+            if age < self.ttl + self.stale_window:
+                self._entries.move_to_end(key)
+                if age >= self.ttl and key not in self._reloading and refresh_scheduler.budget.try_acquire():
+                    self._reloading.add(key)
+                    asyncio.ensure_future(self._reload(key, load))
+                limit_result_lifetime(cached[0] + self.ttl)
+                return cached[1]
+        return await self._load(key, load)
+
+    async def _load(self, key: Hashable, load: Callable[[], Awaitable[Leaderboard]]) -> Leaderboard:
+        leaderboard, _ = await self._flights.do(repr(key), load)
+        if leaderboard.rows:
+            self._entries[key] = (time.time(), leaderboard)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return leaderboard
+
+    async def _reload(self, key: Hashable, load: Callable[[], Awaitable[Leaderboard]]) -> None:
+        # Rebuild from fresh pages, not from stale cached ones
+        serve_stale.set(False)
+        result_lifetime.set(None)
+        try:
+            await self._load(key, load)
+        except (httpx.HTTPError, ValueError) as e:
+            print(f"Error while reloading leaderboard {key}: {e}")
+        finally:
+            self._reloading.discard(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+leaderboard_cache = LeaderboardCache()
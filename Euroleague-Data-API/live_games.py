@@ -0,0 +1,136 @@
+import asyncio
+import os
+import httpx
+from typing import Any, AsyncIterator, Dict, Optional, Set, Tuple
+from enum_code import CompetitionCode
+from structures import GameUpdate
+from resolvers import game_report_endpoint
+from utilities import fetch_euroleague_v3_async
+
+# Seconds between two upstream polls of the same live game
+LIVE_POLL_INTERVAL = float(os.environ.get("EUROLEAGUE_LIVE_POLL_INTERVAL", 5))
+
+# Fields of a game report that are diffed and pushed to subscribers
+TRACKED_FIELDS = ("localScore", "roadScore", "localStandingsScore", "roadStandingsScore", "played")
+
+
+def game_snapshot(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Picks the tracked fields out of a raw game report payload.
+    """
+    local = data.get('local') or {}
+    road = data.get('road') or {}
+    return {
+        "localScore": local.get('score'),
+        "roadScore": road.get('score'),
+        "localStandingsScore": local.get('standingsScore'),
+        "roadStandingsScore": road.get('standingsScore'),
+        "played": data.get('played'),
+    }
+
+
+class LiveGame:
+    """
+    One polled game: its subscribers' queues, the last snapshot and the polling task.
+    """
+
+    def __init__(self, competition_code: CompetitionCode, year: int, game_code: int):
+        self.competition_code = competition_code
+        self.year = year
+        self.game_code = game_code
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.snapshot: Optional[Dict[str, Any]] = None
+        self.task: Optional[asyncio.Task] = None
+
+    def update(self, fields) -> GameUpdate:
+        return GameUpdate(
+            gameCode=self.game_code,
+            changedFields=list(fields),
+            **{field: self.snapshot[field] for field in fields}
+        )
+
+    def broadcast(self, update: Optional[GameUpdate]) -> None:
+        for queue in self.subscribers:
+            queue.put_nowait(update)
+
+
+class LiveGameScheduler:
+    """
+    Polls each subscribed game once per interval, however many subscribers it has.
+
+    The first poll sends the full snapshot. After that, subscribers only get an update when a
+    tracked field changed, holding just the changed fields. Polling stops once the game is
+    played or its last subscriber has left.
+    """
+
+    def __init__(self, interval: float = LIVE_POLL_INTERVAL):
+        self.interval = interval
+        self._games: Dict[Tuple[str, int, int], LiveGame] = {}
+
+    @property
+    def polled_games(self) -> int:
+        return len(self._games)
+
+    async def subscribe(self, competition_code: CompetitionCode, year: int, game_code: int) -> AsyncIterator[GameUpdate]:
+        """
+        Yields the updates of one game until it is played or the caller stops iterating.
+        """
+        key = (competition_code.name, year, game_code)
+        game = self._games.get(key)
+        if game is None:
+            game = LiveGame(competition_code, year, game_code)
+            self._games[key] = game
+        queue: asyncio.Queue = asyncio.Queue()
+        game.subscribers.add(queue)
+        if game.snapshot is not None:
+            # Late subscribers start from the last known state instead of waiting for a change
+            queue.put_nowait(game.update(TRACKED_FIELDS))
+        if game.task is None:
+            game.task = asyncio.ensure_future(self._poll(key, game))
+        try:
+            while True:
+                update = await queue.get()
+                if update is None:
+                    return
+                yield update
+        finally:
+            game.subscribers.discard(queue)
+            if not game.subscribers:
+                game.task.cancel()
+                if self._games.get(key) is game:
+                    del self._games[key]
+
+    async def _poll(self, key: Tuple[str, int, int], game: LiveGame) -> None:
+        endpoint = game_report_endpoint(game.competition_code, game.year, game.game_code)
+        while True:
+            try:
+                if await self._poll_once(endpoint, game):
+                    # Final result: end every subscription to this game
+                    game.broadcast(None)
+                    if self._games.get(key) is game:
+                        del self._games[key]
+                    return
+            except (httpx.HTTPError, ValueError) as e:
+                print(f"Error while polling game {game.game_code}: {e}")
+            except Exception as e:
+                # A malformed payload must not end the task, or every subscriber would wait forever
+                print(f"Unexpected error while polling game {game.game_code}: {type(e).__name__}: {e}")
+            await asyncio.sleep(self.interval)
+
+    @staticmethod
+    async def _poll_once(endpoint: str, game: LiveGame) -> bool:
+        """
+        Fetches the game once and broadcasts the changed fields. Returns whether the game is played.
+        """
+        # The response cache would hide score changes for up to its TTL
+        data = await fetch_euroleague_v3_async(endpoint, bypass_cache=True)
+        snapshot = game_snapshot(data)
+        changed = [field for field in TRACKED_FIELDS
+                   if game.snapshot is None or game.snapshot[field] != snapshot[field]]
+        game.snapshot = snapshot
+        if changed:
+            game.broadcast(game.update(changed))
+        return bool(snapshot["played"])
+
+
+live_game_scheduler = LiveGameScheduler()
@@ -0,0 +1,76 @@
+import os
+from typing import Any, Dict, List, Optional, Union
+from strawberry.dataloader import DataLoader
+from structures import Club
+from resolvers import map_club
+from utilities import gather_bounded, make_euroleague_request_v3_async
+
+# Maximum number of upstream calls a single loader batch keeps in flight
+LOADER_CONCURRENCY = int(os.environ.get("EUROLEAGUE_LOADER_CONCURRENCY", 8))
+# Batches with at least this many club codes try the `clubs` listing first
+CLUB_LISTING_THRESHOLD = int(os.environ.get("EUROLEAGUE_CLUB_LISTING_THRESHOLD", 4))
+CLUB_LISTING_LIMIT = int(os.environ.get("EUROLEAGUE_CLUB_LISTING_LIMIT", 1000))
+
+
+def _map_club_or_error(payload: Any) -> Union[Club, BaseException]:
+    if isinstance(payload, BaseException):
+        return payload
+    try:
+        return map_club(payload)
+    except (KeyError, TypeError, AttributeError) as e:
+        return e
+
+
+async def load_clubs(codes: List[str]) -> List[Union[Club, BaseException]]:
+    """
+    Batch load function for clubs by code.
+
+    Large batches are served from one `clubs` listing fetch; codes the listing does not
+    cover are fetched individually from `clubs/{code}` with bounded concurrency.
+    """
+    payloads: Dict[str, Any] = {}
+    if len(codes) >= CLUB_LISTING_THRESHOLD:
+        listing = await make_euroleague_request_v3_async("clubs", {"Limit": CLUB_LISTING_LIMIT, "Offset": 0})
+        by_code = {club.get('code'): club for club in listing.get('data', [])}
+        payloads = {code: by_code[code] for code in codes if code in by_code}
+
+    missing = [code for code in codes if code not in payloads]
+    fetched = await gather_bounded(
+        [lambda code=code: make_euroleague_request_v3_async(f"clubs/{code}") for code in missing],
+        LOADER_CONCURRENCY
+    )
+    payloads.update(zip(missing, fetched))
+    return [_map_club_or_error(payloads[code]) for code in codes]
+
+
+async def load_club_infos(codes: List[str]) -> List[Union[str, BaseException]]:
+    """
+    Batch load function for `clubs/{code}/info`, fetched with bounded concurrency.
+    """
+    fetched = await gather_bounded(
+        [lambda code=code: make_euroleague_request_v3_async(f"clubs/{code}/info") for code in codes],
+        LOADER_CONCURRENCY
+    )
+    return [data if isinstance(data, BaseException) else data.get('info', '') for data in fetched]
+
+
+def create_loaders() -> Dict[str, DataLoader]:
+    """
+    Creates the DataLoaders for one GraphQL operation. Keys are deduplicated per loader.
+    """
+    return {
+        "club": DataLoader(load_fn=load_clubs),
+        "club_info": DataLoader(load_fn=load_club_infos),
+    }
+
+
+def get_loaders(context: Optional[Any]) -> Dict[str, DataLoader]:
+    """
+    Returns the request's loaders, creating them when the context does not carry any
+    (e.g. when the schema is executed directly instead of through main.py).
+    """
+    if isinstance(context, dict):
+        if "loaders" not in context:
+            context["loaders"] = create_loaders()
+        return context["loaders"]
+    return create_loaders()
@@ -0,0 +1,257 @@
+import asyncio
+import dataclasses
+import json
+import os
+import threading
+import typing
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from structures import GameReport, PlayerTraditionalStatistics
+from mappers import unwrap_optional
+
+# Root directory of the ingested datasets. The schema only reads from it when it is set.
+LOCAL_STORE_PATH = os.environ.get("EUROLEAGUE_LOCAL_STORE_PATH")
+
+MANIFEST_FILE = "_manifest.json"
+
+
+def columns_for(cls: type, prefix: str = "") -> List[str]:
+    """
+    Lists the flattened column names of a strawberry type, one per leaf field.
+
+    Nested object fields are expanded with dotted names (e.g. 'local.club.code'); lists
+    of scalars stay a single column.
+
+    Args:
+        cls (type): The strawberry type from structures.py.
+        prefix (str): The dotted path of the enclosing field.
+
+    Returns:
+        List[str]: The column names in field declaration order.
+    """
+    hints = typing.get_type_hints(cls)
+    columns = []
+    for field in dataclasses.fields(cls):
+        if field.default is not dataclasses.MISSING:
+            # Fields with a default (e.g. derivedMetrics) are computed locally, not read from upstream
+            continue
+        annotation = unwrap_optional(hints[field.name])
+        if dataclasses.is_dataclass(annotation):
+            columns.extend(columns_for(annotation, f"{prefix}{field.name}."))
+        else:
+            columns.append(f"{prefix}{field.name}")
+    return columns
+
+
+GAME_REPORT_COLUMNS = columns_for(GameReport)
+PLAYER_TRADITIONAL_COLUMNS = columns_for(PlayerTraditionalStatistics)
+
+
+def flatten(payload: Dict[str, Any], columns: List[str]) -> Dict[str, Any]:
+    """
+    Picks the values of a raw upstream payload for each dotted column.
+    """
+    row = {}
+    for column in columns:
+        value: Any = payload
+        for part in column.split("."):
+            value = value.get(part) if isinstance(value, dict) else None
+        row[column] = value
+    return row
+
+
+def unflatten(row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Rebuilds the nested upstream payload shape from a flattened row.
+    """
+    payload: Dict[str, Any] = {}
+    for column, value in row.items():
+        *parents, leaf = column.split(".")
+        node = payload
+        for part in parents:
+            node = node.setdefault(part, {})
+        node[leaf] = value
+    return payload
+
+
+class ColumnarTable:
+    """
+    A small on-disk columnar table: one JSON array file per column plus a manifest.
+
+    Writes go to temporary files that replace the old ones, so an interrupted ingestion
+    leaves the last checkpoint intact.
+    """
+
+    def __init__(self, directory: str, columns: List[str], key: Optional[str] = None):
+        self.directory = directory
+        self.key = key
+        self.meta: Dict[str, Any] = {}
+        self.columns: Dict[str, List[Any]] = {column: [] for column in columns}
+        self._index: Dict[Any, int] = {}
+        self._payloads: Optional[List[Dict[str, Any]]] = None
+        self._load()
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()), []))
+
+    def _load(self) -> None:
+        manifest_path = os.path.join(self.directory, MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            return
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        self.meta = manifest.get("meta", {})
+        rows = manifest.get("rows", 0)
+        for column in self.columns:
+            path = self._column_path(column)
+            if os.path.exists(path):
+                with open(path) as f:
+                    self.columns[column] = json.load(f)
+            else:
+                # A column added to structures.py after the data was ingested
+                self.columns[column] = [None] * rows
+        self._reindex()
+
+    def _reindex(self) -> None:
+        if self.key is not None:
+            self._index = {value: i for i, value in enumerate(self.columns[self.key])}
+
+    def _column_path(self, column: str) -> str:
+        return os.path.join(self.directory, f"{column}.json")
+
+    def row(self, i: int) -> Dict[str, Any]:
+        return {column: values[i] for column, values in self.columns.items()}
+
+    def rows(self) -> Iterable[Dict[str, Any]]:
+        return (self.row(i) for i in range(len(self)))
+
+    def get(self, key_value: Any) -> Optional[Dict[str, Any]]:
+        i = self._index.get(key_value)
+        return None if i is None else self.row(i)
+
+    def payloads(self) -> List[Dict[str, Any]]:
+        """
+        Returns every row in the nested upstream payload shape, rebuilt once per load or write.
+
+        The payloads are shared between callers, which must not modify them.
+        """
+        if self._payloads is None:
+            self._payloads = [unflatten(row) for row in self.rows()]
+        return self._payloads
+
+    def upsert(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """
+        Inserts rows, replacing existing rows with the same key value.
+        """
+        self._payloads = None
+        for row in rows:
+            i = self._index.get(row.get(self.key)) if self.key is not None else None
+            if i is None:
+                for column, values in self.columns.items():
+                    values.append(row.get(column))
+                if self.key is not None:
+                    self._index[row.get(self.key)] = len(self) - 1
+            else:
+                for column, values in self.columns.items():
+                    values[i] = row.get(column)
+
+    def truncate(self) -> None:
+        self._payloads = None
+        for column in self.columns:
+            self.columns[column] = []
+        self._index = {}
+
+    def save(self) -> None:
+        """
+        Writes every column and then the manifest, which acts as the commit point.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        for column, values in self.columns.items():
+            self._write_atomic(self._column_path(column), values)
+        self._write_atomic(
+            os.path.join(self.directory, MANIFEST_FILE),
+            {"columns": list(self.columns), "rows": len(self), "meta": self.meta}
+        )
+
+    @staticmethod
+    def _write_atomic(path: str, value: Any) -> None:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(value, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+
+class LocalStore:
+    """
+    Read/write access to the ingested datasets, laid out as
+    `<root>/<competition>/<year>/game_reports` and `<root>/<competition>/<year>/player_traditional`.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self._tables: Dict[Tuple[str, str, int], Tuple[float, ColumnarTable]] = {}
+        self._lock = threading.Lock()
+
+    def game_reports_table(self, competition: str, year: int) -> ColumnarTable:
+        return ColumnarTable(self._dataset_dir(competition, year, "game_reports"), GAME_REPORT_COLUMNS, key="gameCode")
+
+    def player_traditional_table(self, competition: str, year: int) -> ColumnarTable:
+        return ColumnarTable(self._dataset_dir(competition, year, "player_traditional"), PLAYER_TRADITIONAL_COLUMNS)
+
+    def game_report(self, competition: str, year: int, game_code: int) -> Optional[Dict[str, Any]]:
+        """
+        Returns the stored raw payload of a played game, or None if it is not stored yet.
+
+        Unplayed games are left to the network, since their report still changes.
+        """
+        table = self._cached("game_reports", competition, year)
+        row = table.get(game_code) if table is not None else None
+        if row is None or not row.get("played"):
+            return None
+        return unflatten(row)
+
+    def player_traditional(self, competition: str, year: int) -> Optional[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        Returns the total and raw rows of a fully ingested default leaderboard, in rank order.
+        The rows are shared between callers, which must not modify them.
+        """
+        table = self._cached("player_traditional", competition, year)
+        if table is None or not table.meta.get("complete"):
+            return None
+        return table.meta.get("total", len(table)), table.payloads()
+
+    async def game_report_async(self, competition: str, year: int, game_code: int) -> Optional[Dict[str, Any]]:
+        """
+        Like game_report, with the manifest check and any table reload in a worker thread.
+        """
+        return await asyncio.to_thread(self.game_report, competition, year, game_code)
+
+    async def player_traditional_async(self, competition: str, year: int) -> Optional[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        Like player_traditional, with the manifest check and any table reload in a worker thread.
+        """
+        return await asyncio.to_thread(self.player_traditional, competition, year)
+
+    def _dataset_dir(self, competition: str, year: int, dataset: str) -> str:
+        return os.path.join(self.root, competition, str(year), dataset)
+
+    def _cached(self, dataset: str, competition: str, year: int) -> Optional[ColumnarTable]:
+        # Tables are reloaded when a new ingestion run has rewritten the manifest
+        manifest_path = os.path.join(self._dataset_dir(competition, year, dataset), MANIFEST_FILE)
+        try:
+            mtime = os.path.getmtime(manifest_path)
+        except OSError:
+            return None
+        key = (dataset, competition, year)
+        with self._lock:
+            cached = self._tables.get(key)
+            if cached is None or cached[0] != mtime:
+                if dataset == "game_reports":
+                    table = self.game_reports_table(competition, year)
+                else:
+                    table = self.player_traditional_table(competition, year)
+                cached = (mtime, table)
+                self._tables[key] = cached
+            return cached[1]
+
+
+local_store: Optional[LocalStore] = LocalStore(LOCAL_STORE_PATH) if LOCAL_STORE_PATH else None
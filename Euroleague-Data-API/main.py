@@ -1,9 +1,152 @@
+import asyncio
+import contextlib
+import json
+import time
 import strawberry
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, Response
+from starlette.routing import Mount, Route
 from strawberry.asgi import GraphQL
+from strawberry.types.unset import UNSET
 from schema import schema
+from cache import ResultLifetime, limit_result_lifetime, result_lifetime, response_cache
+from document_cache import document_cache
+from loaders import create_loaders
+from metrics import register_stats, render
+from result_cache import CachedResult, RESULT_CACHE_MAX_TTL, operation_key, result_cache
+from tracing import TRACE_ID_HEADER, incoming_trace, span, tracing_enabled
+from utilities import close_clients, refresh_scheduler
+from warmup import warmup, WARMUP_ENABLED
 
-graphql_app = GraphQL(schema)
+
+class EuroleagueGraphQL(GraphQL):
+    async def get_context(self, request, response):
+        # Fresh DataLoaders per operation so batching and dedupe never leak between requests
+        return {"request": request, "response": response, "loaders": create_loaders()}
+
+    async def process_result(self, request, result):
+        if result.errors:
+            # Errors may be transient, so a response carrying any is never cached
+            limit_result_lifetime(time.time())
+        return await super().process_result(request, result)
+
+    def encode_json(self, data):
+        with span("graphql.serialize"):
+            return super().encode_json(data)
+
+    async def run(self, request, context=UNSET, root_value=UNSET):
+        """
+        Runs an HTTP request as the root span of its trace, joining the caller's trace from
+        `traceparent` or the trace ID header, and returns the trace ID in that header.
+        """
+        if not tracing_enabled() or not isinstance(request, Request) or request.scope["type"] != "http":
+            return await self._run_cached(request, context, root_value)
+        trace_id, parent_id = incoming_trace(request.headers)
+        with span("http.request", trace_id, parent_id, method=request.method, path=request.url.path) as current:
+            response = await self._run_cached(request, context, root_value)
+            current.set(status=response.status_code)
+            response.headers[TRACE_ID_HEADER] = current.trace.trace_id
+        return response
+
+    async def _run_cached(self, request, context, root_value):
+        """
+        Serves HTTP operations from the result cache, and caches successful responses for as
+        long as the data they were built from stays valid. Cached and cacheable responses carry
+        `ETag` and `Cache-Control` headers, and a matching `If-None-Match` gets a 304.
+        """
+        key = await self._result_key(request)
+        if key is None:
+            return await super().run(request, context, root_value)
+        cached = result_cache.get(key)
+        if cached is not None:
+            return self._cached_response(request, cached)
+
+        lifetime = ResultLifetime(RESULT_CACHE_MAX_TTL)
+        token = result_lifetime.set(lifetime)
+        try:
+            response = await super().run(request, context, root_value)
+        finally:
+            result_lifetime.reset(token)
+        if (type(response) is Response and response.status_code == 200
+                and response.media_type == "application/json"):
+            cached = result_cache.set(key, bytes(response.body), lifetime.remaining())
+            if cached is not None:
+                return self._cached_response(request, cached)
+        return response
+
+    async def _result_key(self, request):
+        if not isinstance(request, Request) or request.scope["type"] != "http":
+            return None
+        if self.should_render_graphql_ide(self.request_adapter_class(request)):
+            return None
+        if request.method == "GET":
+            return operation_key(dict(request.query_params))
+        if request.method == "POST" and "application/json" in request.headers.get("content-type", ""):
+            try:
+                # Starlette keeps the body, so Strawberry reads it again without a second receive
+                return operation_key(json.loads(await request.body()))
+            except ValueError:
+                return None
+        return None
+
+    @staticmethod
+    def _cached_response(request, cached: CachedResult) -> Response:
+        headers = cached.headers()
+        if request.headers.get("if-none-match") == cached.etag:
+            return Response(status_code=304, headers=headers)
+        return Response(cached.body, media_type="application/json", headers=headers)
+
+
+graphql_app = EuroleagueGraphQL(schema)
+
+
+register_stats("cache", "cache", "response", response_cache.stats)
+register_stats("cache", "cache", "document", document_cache.stats)
+register_stats("cache", "cache", "result", result_cache.stats)
+register_stats("refresh", "scheduler", "upstream", refresh_scheduler.stats)
+
+
+async def metrics(request):
+    """
+    Prometheus scrape endpoint: resolver, operation and upstream latency, upstream status codes
+    and payload sizes, and cache and refresh counters.
+    """
+    return PlainTextResponse(render(), media_type="text/plain; version=0.0.4")
+
+
+async def ready(request):
+    """
+    Readiness probe: 200 once the startup warm-up has finished, 503 with its progress before that.
+    """
+    status = warmup.status()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    # The server accepts requests during warm-up; /ready tells load balancers when to send traffic
+    task = asyncio.ensure_future(warmup.run()) if WARMUP_ENABLED else None
+    if task is None:
+        warmup.skip()
+    try:
+        yield
+    finally:
+        if task is not None:
+            task.cancel()
+        refresh_scheduler.stop()
+        await close_clients()
+
+
+app = Starlette(
+    routes=[
+        Route("/ready", ready),
+        Route("/metrics", metrics),
+        Mount("/", graphql_app),
+    ],
+    lifespan=lifespan,
+)
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(graphql_app, host="0.0.0.0", port=8000)
+    uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,227 @@
+import dataclasses
+import typing
+from typing import Any, Callable, Dict, List, Optional
+from structures import Images
+
+# Mapper functions by strawberry type, compiled on first use
+_MAPPERS: Dict[type, Callable[[Optional[Dict[str, Any]]], Any]] = {}
+
+
+def unwrap_optional(annotation: Any) -> Any:
+    """
+    Returns X for Optional[X], and the annotation itself otherwise.
+    """
+    args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+    if typing.get_origin(annotation) is typing.Union and len(args) == 1:
+        return args[0]
+    return annotation
+
+
+def _map_images(data: Optional[Dict[str, Any]]) -> Images:
+    # Missing images and crests are exposed as an empty crest, as the API always did
+    return Images(crest=(data.get('crest') if isinstance(data, dict) else None) or "")
+
+
+# Types whose mapping differs from the generic field-by-field copy
+_OVERRIDES: Dict[type, Callable[[Optional[Dict[str, Any]]], Any]] = {
+    Images: _map_images,
+}
+
+
+def mapper_for(cls: type) -> Callable[[Optional[Dict[str, Any]]], Any]:
+    """
+    Returns the compiled mapper from a raw upstream payload to a strawberry type.
+
+    The mapper is generated once per type from the dataclass fields in structures.py:
+    scalars are read with a single `.get`, nested types are converted inline in the same
+    function and lists of types are mapped item by item. Missing keys become None (empty
+    lists for list fields), fields with a default such as `derivedMetrics` are left to
+    their default, and the payload is never modified.
+
+    Args:
+        cls (type): The strawberry type from structures.py.
+
+    Returns:
+        Callable: A function taking the payload dict (or None) and returning an instance of cls, or None.
+    """
+    mapper = _OVERRIDES.get(cls) or _MAPPERS.get(cls)
+    if mapper is None:
+        mapper = _compile(cls)
+        _MAPPERS[cls] = mapper
+    return mapper
+
+
+class _Compiler:
+    """
+    Generates the source of one mapper function. Nested types are inlined into the same
+    function, so a whole payload is converted in one call; only list items and overridden
+    types call out to their own mapper.
+    """
+
+    def __init__(self, cls: type):
+        self.cls = cls
+        self.namespace: Dict[str, Any] = {"new": object.__new__}
+        self.lines: List[str] = []
+        self._names = 0
+
+    def name(self, prefix: str, value: Any = None) -> str:
+        self._names += 1
+        name = f"{prefix}{self._names}"
+        if value is not None:
+            self.namespace[name] = value
+        return name
+
+    def build(self, cls: type, source: str, indent: str) -> str:
+        """
+        Emits statements that map the dict in variable `source` to an instance of cls,
+        and returns the variable holding the result.
+        """
+        hints = typing.get_type_hints(cls)
+        get = self.name("get")
+        self.lines.append(f"{indent}{get} = {source}.get")
+        items = []
+        for field in dataclasses.fields(cls):
+            if field.default is not dataclasses.MISSING:
+                items.append((field.name, self.name("default", field.default) if field.default is not None else "None"))
+                continue
+            if field.default_factory is not dataclasses.MISSING:
+                items.append((field.name, f"{self.name('factory', field.default_factory)}()"))
+                continue
+            annotation = unwrap_optional(hints[field.name])
+            value = f"{get}({field.name!r})"
+            if typing.get_origin(annotation) is list:
+                item = unwrap_optional(typing.get_args(annotation)[0])
+                if dataclasses.is_dataclass(item):
+                    mapper = self.name("map", mapper_for(item))
+                    value = f"[{mapper}(x) for x in {value} or ()]"
+                else:
+                    value = f"list({value} or ())"
+            elif annotation in _OVERRIDES:
+                value = f"{self.name('map', _OVERRIDES[annotation])}({value})"
+            elif dataclasses.is_dataclass(annotation):
+                nested = self.name("v")
+                self.lines.append(f"{indent}{nested} = {value}")
+                self.lines.append(f"{indent}if {nested} is not None:")
+                value = self.build(annotation, nested, indent + "    ")
+                self.lines.append(f"{indent}    {nested} = {value}")
+                value = nested
+            items.append((field.name, value))
+
+        result = self.name("r")
+        type_name = self.name("T", cls)
+        if hasattr(cls, "__post_init__"):
+            self.lines.append(f"{indent}{result} = {type_name}({', '.join(f'{name}={value}' for name, value in items)})")
+        else:
+            # Setting __dict__ directly is what the generated dataclass __init__ amounts to,
+            # at less than half the cost for the wide stats rows
+            self.lines.append(f"{indent}{result} = new({type_name})")
+            self.lines.append(f"{indent}{result}.__dict__ = {{{', '.join(f'{name!r}: {value}' for name, value in items)}}}")
+        return result
+
+    def compile(self) -> Callable[[Optional[Dict[str, Any]]], Any]:
+        self.lines = ["    if data is None:", "        return None"]
+        result = self.build(self.cls, "data", "    ")
+        source = "\n".join([f"def map_{self.cls.__name__}(data):", *self.lines, f"    return {result}"])
+        exec(compile(source, f"<mapper {self.cls.__name__}>", "exec"), self.namespace)
+        mapper = self.namespace[f"map_{self.cls.__name__}"]
+        mapper.source = source
+        return mapper
+
+
+def _compile(cls: type) -> Callable[[Optional[Dict[str, Any]]], Any]:
+    return _Compiler(cls).compile()
+
+
+# Lazy record classes by strawberry type, created on first use
+_LAZY_TYPES: Dict[type, type] = {}
+
+
+def lazy_mapper_for(cls: type) -> Callable[[Optional[Dict[str, Any]]], Any]:
+    """
+    Returns a mapper that wraps a raw upstream payload in a lazy record instead of converting it.
+
+    The record is a `__slots__` class with one property per field of the strawberry type:
+    scalars are read from the payload when Strawberry resolves them, and nested objects and
+    lists are only built, then kept, the first time they are selected. Fields with a default
+    (e.g. `derivedMetrics`) are plain attributes. The payload must not be modified while
+    records wrap it.
+
+    Args:
+        cls (type): The strawberry type from structures.py.
+
+    Returns:
+        Callable: A function taking the payload dict (or None) and returning a lazy record, or None.
+    """
+    lazy_type = lazy_type_for(cls)
+
+    def wrap(data: Optional[Dict[str, Any]]) -> Any:
+        return None if data is None else lazy_type(data)
+
+    return _OVERRIDES.get(cls) or wrap
+
+
+def lazy_type_for(cls: type) -> type:
+    lazy_type = _LAZY_TYPES.get(cls)
+    if lazy_type is None:
+        lazy_type = _build_lazy_type(cls)
+        _LAZY_TYPES[cls] = lazy_type
+    return lazy_type
+
+
+def _scalar_property(name: str) -> property:
+    return property(lambda self: self._data.get(name))
+
+
+def _cached_property(name: str, slot: str, build: Callable[[Any], Any]) -> property:
+    def get(self):
+        try:
+            return getattr(self, slot)
+        except AttributeError:
+            value = build(self._data.get(name))
+            setattr(self, slot, value)
+            return value
+    return property(get)
+
+
+def _build_lazy_type(cls: type) -> type:
+    hints = typing.get_type_hints(cls)
+    slots = ["_data"]
+    namespace: Dict[str, Any] = {}
+    defaults: Dict[str, Callable[[], Any]] = {}
+    for field in dataclasses.fields(cls):
+        if field.default is not dataclasses.MISSING:
+            slots.append(field.name)
+            defaults[field.name] = lambda value=field.default: value
+            continue
+        if field.default_factory is not dataclasses.MISSING:
+            slots.append(field.name)
+            defaults[field.name] = field.default_factory
+            continue
+        annotation = unwrap_optional(hints[field.name])
+        if typing.get_origin(annotation) is list:
+            item = unwrap_optional(typing.get_args(annotation)[0])
+            if dataclasses.is_dataclass(item):
+                wrap_item = lazy_mapper_for(item)
+                build = lambda value, wrap_item=wrap_item: [wrap_item(x) for x in value or ()]
+            else:
+                build = lambda value: list(value or ())
+        elif dataclasses.is_dataclass(annotation):
+            build = lazy_mapper_for(annotation)
+        else:
+            namespace[field.name] = _scalar_property(field.name)
+            continue
+        slot = f"_{field.name}"
+        slots.append(slot)
+        namespace[field.name] = _cached_property(field.name, slot, build)
+
+    def __init__(self, data: Dict[str, Any]):
+        self._data = data
+        for name, default in defaults.items():
+            setattr(self, name, default())
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self._data!r})"
+
+    namespace.update({"__slots__": tuple(slots), "__init__": __init__, "__repr__": __repr__,
+                      "__doc__": f"Lazy record exposing a raw payload as a {cls.__name__}."})
+    return type(f"Lazy{cls.__name__}", (), namespace)
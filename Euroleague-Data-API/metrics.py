@@ -0,0 +1,266 @@
+import bisect
+import inspect
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+from strawberry.extensions import SchemaExtension
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# Path segments followed by an identifier, and the placeholder that replaces it in endpoint labels
+_ID_SEGMENTS = {
+    "clubs": "{code}",
+    "competitions": "{c}",
+    "seasons": "{s}",
+    "games": "{g}",
+    "people": "{p}",
+}
+# Counters from stats() that describe a current size rather than a running total
+_GAUGE_STATS = frozenset({"entries", "bytes", "tracked_keys", "pending"})
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class Counter:
+    """
+    Thread-safe monotonically increasing counter, one series per label combination.
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = defaultdict(float)
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def inc(self, amount: float = 1.0, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] += amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        lines += [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+                  for labels, value in values]
+        return lines
+
+
+class Histogram:
+    """
+    Thread-safe histogram with fixed buckets, one series per label combination.
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # Per series: [count in each bucket (not cumulative) plus +Inf, sum]
+        self._series: Dict[Tuple[str, ...], List[Any]] = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            series = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._series.items())
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in series:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                bucket_labels = _format_labels((*self.labelnames, "le"), (*labels, _format_value(bound)))
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(total)}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+REGISTRY: List[Any] = []
+# stats() callables rendered at scrape time, by metric prefix and label value
+_STATS_SOURCES: List[Tuple[str, str, str, Callable[[], Dict[str, int]]]] = []
+
+UPSTREAM_LATENCY = Histogram(
+    "euroleague_upstream_request_duration_seconds",
+    "Upstream request latency per attempt, by API version, endpoint template and status code.",
+    ("api", "endpoint", "status"),
+)
+UPSTREAM_RESPONSE_BYTES = Histogram(
+    "euroleague_upstream_response_bytes",
+    "Upstream response body size, by API version and endpoint template.",
+    ("api", "endpoint"),
+    buckets=SIZE_BUCKETS,
+)
+RESOLVER_LATENCY = Histogram(
+    "euroleague_resolver_duration_seconds",
+    "GraphQL resolver latency for root and async fields, by parent type and field.",
+    ("type", "field"),
+)
+OPERATION_LATENCY = Histogram(
+    "euroleague_graphql_operation_duration_seconds",
+    "GraphQL operation latency, parsing and validation included, by operation type.",
+    ("operation_type",),
+)
+OPERATION_ERRORS = Counter(
+    "euroleague_graphql_operation_errors_total",
+    "GraphQL operations that returned errors, by operation type.",
+    ("operation_type",),
+)
+
+
+def endpoint_template(url: str) -> Tuple[str, str]:
+    """
+    Splits an upstream URL into its API version and a low-cardinality endpoint template.
+
+    Args:
+        url (str): The full upstream URL, e.g. 'https://api-live.euroleague.net/v3/clubs/MAD/info'.
+
+    Returns:
+        Tuple[str, str]: The version and the template, e.g. ('v3', 'clubs/{code}/info').
+    """
+    segments = [segment for segment in urlsplit(url).path.split("/") if segment]
+    version = segments.pop(0) if segments and re.fullmatch(r"v\d+", segments[0]) else ""
+    template = [_ID_SEGMENTS.get(previous, segment) if previous in _ID_SEGMENTS else segment
+                for previous, segment in zip([None, *segments], segments)]
+    return version, "/".join(template)
+
+
+def observe_upstream(url: str, status: str, seconds: float, size: Optional[int] = None) -> None:
+    """
+    Records one upstream attempt.
+
+    Args:
+        url (str): The requested URL.
+        status (str): The HTTP status code, or 'error' when no response arrived.
+        seconds (float): The attempt's duration.
+        size (Optional[int]): The response body size in bytes, when there is one.
+    """
+    version, template = endpoint_template(url)
+    UPSTREAM_LATENCY.observe(seconds, version, template, status)
+    if size is not None:
+        UPSTREAM_RESPONSE_BYTES.observe(size, version, template)
+
+
+def register_stats(prefix: str, label: str, value: str, stats: Callable[[], Dict[str, int]]) -> None:
+    """
+    Exposes a `stats()` dict at scrape time, e.g. the hit and miss counters of a cache.
+
+    Each key becomes `euroleague_<prefix>_<key>_total`, or `euroleague_<prefix>_<key>` for sizes
+    such as `entries` and `bytes`, labelled `<label>="<value>"`.
+    """
+    _STATS_SOURCES.append((prefix, label, value, stats))
+
+
+def _render_stats() -> List[str]:
+    families: Dict[str, Tuple[str, List[str]]] = {}
+    for prefix, label, value, stats in _STATS_SOURCES:
+        for key, number in stats().items():
+            kind = "gauge" if key in _GAUGE_STATS else "counter"
+            name = f"euroleague_{prefix}_{key}" + ("_total" if kind == "counter" else "")
+            families.setdefault(name, (kind, []))[1].append(
+                f"{name}{_format_labels((label,), (value,))} {_format_value(number)}")
+    lines = []
+    for name, (kind, samples) in families.items():
+        lines += [f"# TYPE {name} {kind}", *samples]
+    return lines
+
+
+def render() -> str:
+    """
+    Returns every metric in the Prometheus text exposition format.
+    """
+    lines = []
+    for metric in REGISTRY:
+        lines += metric.render()
+    lines += _render_stats()
+    return "\n".join(lines) + "\n"
+
+
+class MetricsExtension(SchemaExtension):
+    """
+    Records operation latency and errors.
+
+    Resolver latency is recorded by time_root_fields() instead of a `resolve` hook, which would
+    wrap every field of large result sets and take them off graphql-core's default resolver path.
+    """
+
+    def on_operation(self):
+        start = time.perf_counter()
+        yield
+        context = self.execution_context
+        try:
+            operation_type = context.operation_type.value
+        except RuntimeError:
+            operation_type = "unknown"
+        OPERATION_LATENCY.observe(time.perf_counter() - start, operation_type)
+        if context.pre_execution_errors or (context.result is not None and context.result.errors):
+            OPERATION_ERRORS.inc(1, operation_type)
+
+
+def time_root_fields(schema) -> None:
+    """
+    Wraps the resolver of every root field once so it records RESOLVER_LATENCY.
+
+    Only root fields are timed: every async resolver is a root field, and the others are
+    plain attribute reads on mapped objects.
+
+    Args:
+        schema (strawberry.Schema): The schema to instrument.
+    """
+    graphql_schema = schema._schema
+    for root in (graphql_schema.query_type, graphql_schema.mutation_type, graphql_schema.subscription_type):
+        if root is None:
+            continue
+        for name, field in root.fields.items():
+            if field.resolve is not None and not getattr(field.resolve, "timed", False):
+                field.resolve = _timed_resolver(field.resolve, root.name, name)
+
+
+def _timed_resolver(resolve: Callable, parent: str, field: str) -> Callable:
+    def timed(root, info, *args, **kwargs):
+        start = time.perf_counter()
+        result = resolve(root, info, *args, **kwargs)
+        if inspect.isawaitable(result):
+            return _observe_async(result, start, parent, field)
+        RESOLVER_LATENCY.observe(time.perf_counter() - start, parent, field)
+        return result
+
+    timed.timed = True
+    return timed
+
+
+async def _observe_async(result, start: float, parent: str, field: str):
+    try:
+        return await result
+    finally:
+        RESOLVER_LATENCY.observe(time.perf_counter() - start, parent, field)
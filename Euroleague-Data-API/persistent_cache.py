@@ -0,0 +1,127 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+from cache import CacheEntry, STALE_WHILE_REVALIDATE
+
+# The persistent layer is only enabled when a database path is configured
+PERSISTENT_CACHE_PATH = os.environ.get("EUROLEAGUE_PERSISTENT_CACHE_PATH")
+PERSISTENT_CACHE_MAX_BYTES = int(os.environ.get("EUROLEAGUE_PERSISTENT_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+# Compaction runs automatically after this many writes
+PERSISTENT_CACHE_COMPACT_EVERY = int(os.environ.get("EUROLEAGUE_PERSISTENT_CACHE_COMPACT_EVERY", 500))
+
+
+class PersistentCache:
+    """
+    SQLite-backed store of raw upstream response bodies that survives restarts.
+
+    Each row keeps the body with its fetch timestamp and TTL, so entries read back after a
+    restart expire exactly as they would have in memory. Compaction drops rows past their
+    stale-while-revalidate window and then the least recently accessed ones until the
+    database fits in `max_bytes`.
+    """
+
+    def __init__(self, path: str, max_bytes: int = PERSISTENT_CACHE_MAX_BYTES,
+                 compact_every: int = PERSISTENT_CACHE_COMPACT_EVERY):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.compact_every = compact_every
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._compactor: Optional[threading.Thread] = None
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        # auto_vacuum must be set before the first table is created to take effect
+        self._conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " body BLOB NOT NULL,"
+            " fetched_at REAL NOT NULL,"
+            " ttl REAL,"
+            " size INTEGER NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+
+    def get(self, key: str, stale_window: float = 0.0) -> Optional[CacheEntry]:
+        """
+        Returns the entry stored for a key, or None if it is missing or expired for longer than `stale_window`.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, fetched_at, ttl FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            entry = CacheEntry(body=bytes(row[0]), fetched_at=row[1], ttl=row[2])
+            if not entry.is_servable(stale_window):
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            return entry
+
+    def set(self, key: str, body: bytes, ttl: Optional[float], fetched_at: Optional[float] = None) -> None:
+        """
+        Stores a response body with its fetch timestamp and TTL.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, body, fetched_at, ttl, size, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, body, fetched_at or now, ttl, len(key) + len(body), now)
+            )
+            self._writes += 1
+            compact = self.compact_every > 0 and self._writes % self.compact_every == 0
+            if compact and self._compactor is not None and self._compactor.is_alive():
+                compact = False
+            if compact:
+                # Off the caller's thread, so the write that triggers it is not held up by the vacuum
+                self._compactor = threading.Thread(target=self.compact, name="persistent-cache-compaction", daemon=True)
+        if compact:
+            self._compactor.start()
+
+    def compact(self) -> int:
+        """
+        Deletes entries that can no longer be served stale, then the least recently accessed ones above the size cap.
+
+        Returns:
+            int: The number of deleted entries.
+        """
+        now = time.time()
+        with self._lock:
+            deleted = self._conn.execute(
+                "DELETE FROM responses WHERE ttl IS NOT NULL AND fetched_at + ttl + ? <= ?",
+                (STALE_WHILE_REVALIDATE, now)
+            ).rowcount
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                over = []
+                for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at ASC"):
+                    if total <= self.max_bytes:
+                        break
+                    over.append((key,))
+                    total -= size
+                self._conn.executemany("DELETE FROM responses WHERE key = ?", over)
+                deleted += len(over)
+            self._conn.execute("PRAGMA incremental_vacuum")
+            return deleted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.execute("PRAGMA incremental_vacuum")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+persistent_cache: Optional[PersistentCache] = (
+    PersistentCache(PERSISTENT_CACHE_PATH) if PERSISTENT_CACHE_PATH else None
+)
@@ -0,0 +1,118 @@
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+from structures import PlayerDerivedMetrics, PlayerTraditionalStatistics
+
+# Numeric fields of PlayerTraditionalStatistics loaded into the table as float64 columns
+NUMERIC_FIELDS = (
+    "gamesPlayed", "gamesStarted", "minutesPlayed", "pointsScored",
+    "twoPointersMade", "twoPointersAttempted", "threePointersMade", "threePointersAttempted",
+    "freeThrowsMade", "freeThrowsAttempted", "offensiveRebounds", "defensiveRebounds",
+    "totalRebounds", "assists", "steals", "turnovers", "blocks", "blocksAgainst",
+    "foulsCommited", "foulsDrawn", "pir",
+)
+# Percentage fields the upstream API returns as strings such as "45.5%"
+PERCENTAGE_FIELDS = ("twoPointersPercentage", "threePointersPercentage", "freeThrowsPercentage")
+
+
+def parse_percentage(value: Optional[str]) -> float:
+    """
+    Parses an upstream percentage string ("45.5%") into a float, NaN if missing or malformed.
+    """
+    if value is None:
+        return np.nan
+    try:
+        return float(str(value).strip().rstrip("%"))
+    except ValueError:
+        return np.nan
+
+
+class PlayerStatsTable:
+    """
+    Column-oriented NumPy view of a traditional stats leaderboard.
+
+    Every numeric field becomes a float64 array (NaN for missing values) and the percentage
+    strings are parsed once, so derived metrics are computed for all rows in one pass.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], size: int):
+        self.columns = columns
+        self.size = size
+
+    @classmethod
+    def from_players(cls, players: Sequence[PlayerTraditionalStatistics]) -> "PlayerStatsTable":
+        columns = {
+            field: np.array([getattr(player, field) for player in players], dtype=np.float64)
+            for field in NUMERIC_FIELDS
+        }
+        for field in PERCENTAGE_FIELDS:
+            columns[field] = np.array([parse_percentage(getattr(player, field)) for player in players], dtype=np.float64)
+        return cls(columns, len(players))
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Dict]) -> "PlayerStatsTable":
+        """
+        Builds the table straight from raw upstream leaderboard rows.
+        """
+        columns = {
+            field: np.array([row.get(field) for row in rows], dtype=np.float64)
+            for field in NUMERIC_FIELDS
+        }
+        for field in PERCENTAGE_FIELDS:
+            columns[field] = np.array([parse_percentage(row.get(field)) for row in rows], dtype=np.float64)
+        return cls(columns, len(rows))
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        return self.columns[field]
+
+    def derived_metrics(self) -> Dict[str, np.ndarray]:
+        """
+        Computes the derived metrics for every row.
+
+        Returns:
+            Dict[str, np.ndarray]: One array per PlayerDerivedMetrics field, NaN where undefined.
+        """
+        c = self.columns
+        field_goals_attempted = c["twoPointersAttempted"] + c["threePointersAttempted"]
+        field_goals_made = c["twoPointersMade"] + c["threePointersMade"]
+        true_shooting_attempts = field_goals_attempted + 0.44 * c["freeThrowsAttempted"]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            per_36 = 36.0 / c["minutesPlayed"]
+            metrics = {
+                "twoPointersPercentage": c["twoPointersPercentage"],
+                "threePointersPercentage": c["threePointersPercentage"],
+                "freeThrowsPercentage": c["freeThrowsPercentage"],
+                "trueShootingPercentage": 100.0 * c["pointsScored"] / (2.0 * true_shooting_attempts),
+                "effectiveFieldGoalPercentage": 100.0 * (field_goals_made + 0.5 * c["threePointersMade"]) / field_goals_attempted,
+                "assistTurnoverRatio": c["assists"] / c["turnovers"],
+                "pointsPer36": c["pointsScored"] * per_36,
+                "reboundsPer36": c["totalRebounds"] * per_36,
+                "assistsPer36": c["assists"] * per_36,
+                "stealsPer36": c["steals"] * per_36,
+                "blocksPer36": c["blocks"] * per_36,
+                "turnoversPer36": c["turnovers"] * per_36,
+                "pirPer36": c["pir"] * per_36,
+                # Possessions a player finishes (shots, trips to the line, turnovers) per 36 minutes
+                "usagePer36": (true_shooting_attempts + c["turnovers"]) * per_36,
+                "threePointAttemptRate": 100.0 * c["threePointersAttempted"] / field_goals_attempted,
+                "freeThrowRate": 100.0 * c["freeThrowsAttempted"] / field_goals_attempted,
+            }
+        # Division by zero yields inf; treat it as undefined like NaN
+        return {name: np.where(np.isfinite(values), values, np.nan) for name, values in metrics.items()}
+
+
+def attach_derived_metrics(players: List[PlayerTraditionalStatistics]) -> List[PlayerTraditionalStatistics]:
+    """
+    Computes derived metrics for a whole leaderboard page at once and sets
+    `derivedMetrics` on every row.
+    """
+    if not players:
+        return players
+    metrics = PlayerStatsTable.from_players(players).derived_metrics()
+    # tolist() converts the columns to Python floats in one call per column
+    rows = zip(*(metrics[name].tolist() for name in metrics))
+    for player, values in zip(players, rows):
+        player.derivedMetrics = PlayerDerivedMetrics(
+            **{name: None if value != value else round(value, 2) for name, value in zip(metrics, values)}
+        )
+    return players
@@ -1,28 +1,77 @@
 import strawberry
 from typing import Optional, List
-from resolvers import get_clubs, get_club_by_code, get_club_info, get_game_report, get_player_traditional
-from structures import Club, GameReport, PlayerTraditionalResponse
+from resolvers import get_clubs_async, get_game_report_async, get_game_reports_async, get_player_traditional_async
+from loaders import get_loaders
+from selection import is_selected, selected_names
+from club_index import club_index, SERVE_CLUBS_FROM_INDEX
+from club_search import club_search_index
+from structures import Club, ClubConnection, GameReport, GameReportResult, GameCodeRange, PlayerTraditionalResponse
 from enum_code import ClubCode, CompetitionCode, CompetitionCode, SeasonMode, PhaseTypeCode, StatsMode, StatsSortMode, Stats, SortDirection
 
 @strawberry.type
 class Query:
 
     @strawberry.field
-    def clubs(self, limit: Optional[int] = 10, offset: Optional[int] = 0) -> List[Club]:
+    async def clubs(self, limit: Optional[int] = 10, offset: Optional[int] = 0, search: Optional[str] = None) -> List[Club]:
         """
         Fetches a list of clubs with optional limit and offset.
         
         Args:
             limit (Optional[int]): The maximum number of clubs to return.
             offset (Optional[int]): The offset for pagination.
+            search (Optional[str]): Text the upstream API matches clubs against.
         
         Returns:
             List[Club]: A list of Club objects.
         """
-        return get_clubs(limit=limit, offset=offset)
+        if search is None and SERVE_CLUBS_FROM_INDEX:
+            # Pages of the plain listing are sliced from the club index once it has been loaded
+            await club_index.ensure_loaded(wait=False)
+            if club_index.is_loaded:
+                start = offset or 0
+                return club_index.clubs[start:start + limit if limit is not None else None]
+        return await get_clubs_async(limit=limit, offset=offset, search=search)
 
     @strawberry.field
-    def club_by_code(self, club_code: ClubCode) -> Optional[Club]:
+    async def search_clubs(self, query: str, limit: Optional[int] = 10) -> List[Club]:
+        """
+        Ranked club search for autocomplete, answered from a local prefix/trigram index.
+        
+        Args:
+            query (str): The search text, matched against code, name, alias, city and country.
+            limit (Optional[int]): The maximum number of clubs to return.
+        
+        Returns:
+            List[Club]: The matching clubs, best match first.
+        """
+        # The index answers from the ClubCode seeds until the full listing has been loaded
+        await club_index.ensure_loaded(wait=False)
+        return club_search_index.search(query, limit)
+
+    @strawberry.field
+    async def clubs_connection(
+        self,
+        first: Optional[int] = None,
+        after: Optional[str] = None,
+        last: Optional[int] = None,
+        before: Optional[str] = None
+    ) -> ClubConnection:
+        """
+        Relay-style cursor pagination over all clubs, served from a periodically refreshed in-memory index.
+        
+        Args:
+            first (Optional[int]): Number of clubs after `after` (default 10 when `last` is not set).
+            after (Optional[str]): Cursor of the club to start after.
+            last (Optional[int]): Number of clubs before `before`.
+            before (Optional[str]): Cursor of the club to end before.
+        
+        Returns:
+            ClubConnection: The page of clubs with its cursors, pageInfo and totalCount.
+        """
+        return await club_index.connection(first=first, after=after, last=last, before=before)
+
+    @strawberry.field
+    async def club_by_code(self, info: strawberry.Info, club_code: ClubCode) -> Optional[Club]:
         """
         Fetch a specific club by its code from the Euroleague API.
         
@@ -32,11 +81,16 @@ class Query:
         Returns:
             Optional[Club]: The Club object corresponding to the club code, or None if not found.
         """
-        return get_club_by_code(club_code)
+        if SERVE_CLUBS_FROM_INDEX:
+            await club_index.ensure_loaded(wait=False)
+            club = club_index.local_club(club_code, selected_names(info))
+            if club is not None:
+                return club
+        return await get_loaders(info.context)["club"].load(club_code.name)
 
 
     @strawberry.field
-    def club_info(self, club_code: ClubCode) -> Optional[str]:
+    async def club_info(self, info: strawberry.Info, club_code: ClubCode) -> Optional[str]:
         """
         Fetch additional info for a specific club by its code.
         
@@ -46,10 +100,10 @@ class Query:
         Returns:
             Optional[str]: The info string returned by the API, or None if not found.
         """
-        return get_club_info(club_code.name)
+        return await get_loaders(info.context)["club_info"].load(club_code.name)
     
     @strawberry.field
-    def game_report(self, competition_code: CompetitionCode = CompetitionCode.E.value, year: int = 2024, game_code: int = 1) -> Optional[GameReport]:
+    async def game_report(self, competition_code: CompetitionCode = CompetitionCode.E.value, year: int = 2024, game_code: int = 1) -> Optional[GameReport]:
         """
         Fetches the game report for a specific game based on competitionCode, season year, and gameCode.
         
@@ -61,11 +115,40 @@ class Query:
         Returns:
             Optional[GameReport]: The game report or None if not found.
         """
-        return get_game_report(competition_code, year, game_code)
+        return await get_game_report_async(competition_code, year, game_code)
+    
+    @strawberry.field
+    async def game_reports(
+        self,
+        competition_code: CompetitionCode,
+        year: int,
+        game_codes: Optional[List[int]] = None,
+        game_code_range: Optional[GameCodeRange] = None,
+        concurrency: Optional[int] = None
+    ) -> List[GameReportResult]:
+        """
+        Fetches the game reports for many games of a season concurrently.
+        
+        Args:
+            competition_code (CompetitionCode): The enum value representing the competition.
+            year (int): The year of the season (YYYY format).
+            game_codes (Optional[List[int]]): The game codes to fetch.
+            game_code_range (Optional[GameCodeRange]): An inclusive range of game codes, used instead of game_codes.
+            concurrency (Optional[int]): The maximum number of reports fetched at the same time.
+        
+        Returns:
+            List[GameReportResult]: One result per game code in request order, each with its report or error.
+        """
+        if (game_codes is None) == (game_code_range is None):
+            raise ValueError("Provide exactly one of gameCodes or gameCodeRange")
+        if game_code_range is not None:
+            game_codes = list(range(game_code_range.start, game_code_range.end + 1))
+        return await get_game_reports_async(competition_code, year, game_codes, concurrency)
     
     @strawberry.field
-    def player_traditional(
+    async def player_traditional(
         self,
+        info: strawberry.Info,
         competition_code: CompetitionCode,
         season_mode: Optional[SeasonMode] = None,
         season_code: Optional[int] = None,
@@ -77,9 +160,14 @@ class Query:
         statistic: Optional[Stats] = None,
         sort_direction: Optional[SortDirection] = None,
         offset: Optional[int] = 0,
-        limit: Optional[int] = 10
+        limit: Optional[int] = 10,
+        min_games_played: Optional[float] = None,
+        team_code: Optional[str] = None,
+        min_age: Optional[int] = None,
+        max_age: Optional[int] = None,
+        all_rows: bool = False
     ) -> PlayerTraditionalResponse:
-        return get_player_traditional(
+        return await get_player_traditional_async(
             competition_code=competition_code,
             season_mode=season_mode,
             season_code=season_code,
@@ -91,5 +179,11 @@ class Query:
             statistic=statistic,
             sort_direction=sort_direction,
             offset=offset,
-            limit=limit
+            limit=limit,
+            min_games_played=min_games_played,
+            team_code=team_code,
+            min_age=min_age,
+            max_age=max_age,
+            all_rows=all_rows,
+            derived_metrics=is_selected(info, "players", "derivedMetrics")
         )
\ No newline at end of file
@@ -0,0 +1,186 @@
+import asyncio
+import os
+import time
+import httpx
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+from cache import ResponseCache, response_cache, serve_stale, result_lifetime
+
+# Upstream requests per minute the scheduler may spend on background refreshes
+REFRESH_BUDGET = float(os.environ.get("EUROLEAGUE_REFRESH_BUDGET", 60))
+# Seconds between two passes over the hot keys
+REFRESH_INTERVAL = float(os.environ.get("EUROLEAGUE_REFRESH_INTERVAL", 5))
+# Hot keys are refreshed once less than this share of their TTL is left
+REFRESH_AHEAD_RATIO = float(os.environ.get("EUROLEAGUE_REFRESH_AHEAD_RATIO", 0.2))
+# Decayed access count a key needs to be refreshed proactively, and the decay half-life in seconds
+HOT_KEY_MIN_SCORE = float(os.environ.get("EUROLEAGUE_HOT_KEY_MIN_SCORE", 3))
+ACCESS_HALF_LIFE = float(os.environ.get("EUROLEAGUE_ACCESS_HALF_LIFE", 10 * 60))
+# Maximum number of keys whose access frequency is tracked
+MAX_TRACKED_KEYS = int(os.environ.get("EUROLEAGUE_MAX_TRACKED_KEYS", 2000))
+
+
+class TokenBucket:
+    """
+    Allows `rate_per_minute` acquisitions per minute, with bursts up to one minute's worth.
+    """
+
+    def __init__(self, rate_per_minute: float):
+        self.capacity = max(0.0, rate_per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        if self.tokens < tokens:
+            return False
+        self.tokens -= tokens
+        return True
+
+
+@dataclass
+class KeyAccess:
+    endpoint: str
+    params: Dict[str, Any]
+    score: float
+    updated_at: float
+
+    def decayed(self, now: float) -> float:
+        return self.score * 0.5 ** ((now - self.updated_at) / ACCESS_HALF_LIFE)
+
+
+class RefreshScheduler:
+    """
+    Refreshes cached upstream responses in the background.
+
+    Stale entries served under stale-while-revalidate are refreshed once each. A periodic
+    pass also refreshes hot keys, ranked by exponentially decayed access count, shortly
+    before they expire. Both share one token bucket, so background traffic never exceeds
+    the configured request budget; refreshes over budget are skipped and the stale entry
+    keeps being served until a later request or pass finds budget.
+    """
+
+    def __init__(self, fetch: Callable[[str, Dict[str, Any]], Awaitable[Any]],
+                 cache: ResponseCache = response_cache,
+                 budget: float = REFRESH_BUDGET,
+                 interval: float = REFRESH_INTERVAL):
+        self.fetch = fetch
+        self.cache = cache
+        self.budget = TokenBucket(budget)
+        self.interval = interval
+        self._keys: Dict[str, KeyAccess] = {}
+        self._pending: Set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+        self.revalidations = 0
+        self.proactive_refreshes = 0
+        self.over_budget = 0
+        self.failures = 0
+
+    def record(self, key: str, endpoint: str, params: Dict[str, Any]) -> None:
+        """
+        Counts one access to a key and makes sure the periodic pass is running.
+        """
+        now = time.time()
+        access = self._keys.get(key)
+        if access is None:
+            if len(self._keys) >= MAX_TRACKED_KEYS:
+                coldest = min(self._keys, key=lambda k: self._keys[k].decayed(now))
+                del self._keys[coldest]
+            access = KeyAccess(endpoint, params, 0.0, now)
+            self._keys[key] = access
+        access.score = access.decayed(now) + 1.0
+        access.updated_at = now
+        self._ensure_running()
+
+    def revalidate(self, key: str, endpoint: str, params: Dict[str, Any], proactive: bool = False) -> bool:
+        """
+        Starts a background refresh of one key unless one is already running or the budget is spent.
+
+        Returns:
+            bool: Whether a refresh was started.
+        """
+        if key in self._pending:
+            return False
+        if not self.budget.try_acquire():
+            self.over_budget += 1
+            return False
+        self._pending.add(key)
+        if proactive:
+            self.proactive_refreshes += 1
+        else:
+            self.revalidations += 1
+        asyncio.ensure_future(self._refresh(key, endpoint, params))
+        return True
+
+    def hot_keys(self, now: Optional[float] = None) -> List[str]:
+        """
+        Returns the tracked keys at or above HOT_KEY_MIN_SCORE, hottest first.
+        """
+        now = now or time.time()
+        scores = {key: access.decayed(now) for key, access in self._keys.items()}
+        return sorted((key for key, score in scores.items() if score >= HOT_KEY_MIN_SCORE),
+                      key=lambda key: -scores[key])
+
+    def refresh_due(self) -> int:
+        """
+        Refreshes hot keys that are close to expiring, hottest first, until the budget runs out.
+
+        Returns:
+            int: The number of refreshes started.
+        """
+        now = time.time()
+        started = 0
+        for key in self.hot_keys(now):
+            entry = self.cache.peek(key)
+            if entry is None or entry.ttl is None:
+                continue
+            if entry.expires_at - now > entry.ttl * REFRESH_AHEAD_RATIO:
+                continue
+            access = self._keys[key]
+            if self.revalidate(key, access.endpoint, access.params, proactive=True):
+                started += 1
+            elif self.budget.tokens < 1:
+                break
+        return started
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "tracked_keys": len(self._keys),
+            "pending": len(self._pending),
+            "revalidations": self.revalidations,
+            "proactive_refreshes": self.proactive_refreshes,
+            "over_budget": self.over_budget,
+            "failures": self.failures,
+        }
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            self.refresh_due()
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _ensure_running(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._task = loop.create_task(self.run())
+
+    async def _refresh(self, key: str, endpoint: str, params: Dict[str, Any]) -> None:
+        serve_stale.set(False)
+        # Detached from the operation that triggered it, which may have been answered already
+        result_lifetime.set(None)
+        try:
+            await self.fetch(endpoint, params)
+        except (httpx.HTTPError, ValueError) as e:
+            self.failures += 1
+            print(f"Error while refreshing {key}: {e}")
+        finally:
+            self._pending.discard(key)
@@ -1,77 +1,71 @@
 # resolvers.py
-from typing import List, Optional
-from structures import (Club, Venue, Images, Country, GameReport, Group, PhaseType, Season, 
-                        GameTeam, GameClub,PlayerTraditionalResponse, PlayerTraditionalStatistics, Player, PlayerTeam)
-from utilities import make_euroleague_request_v3
+import os
+import time
+import httpx
+from typing import AsyncIterator, List, Optional, Tuple
+from structures import Club, GameReport, GameReportResult, PlayerTraditionalResponse, PlayerTraditionalStatistics
+from mappers import mapper_for, lazy_mapper_for
+from utilities import (make_euroleague_request_v3, make_euroleague_request_v3_async, fetch_euroleague_v3_async,
+                       gather_bounded, describe_upstream_error, iter_pages_async)
+from local_store import local_store
+from player_metrics import attach_derived_metrics
+from tracing import span
+from cache import limit_result_lifetime
+from leaderboard import Leaderboard, leaderboard_cache, LEADERBOARD_PAGE_SIZE, LEADERBOARD_PAGE_CONCURRENCY, STAT_FIELDS
 from enum_code import ClubCode, CompetitionCode, CompetitionCode, SeasonMode, PhaseTypeCode, StatsMode, StatsSortMode, Stats, SortDirection
 
+# Bulk game report fetches: default and maximum number of reports in flight, and batch size cap
+GAME_REPORTS_CONCURRENCY = int(os.environ.get("EUROLEAGUE_GAME_REPORTS_CONCURRENCY", 16))
+MAX_GAME_REPORTS_CONCURRENCY = int(os.environ.get("EUROLEAGUE_MAX_GAME_REPORTS_CONCURRENCY", 64))
+MAX_GAME_REPORTS = int(os.environ.get("EUROLEAGUE_MAX_GAME_REPORTS", 500))
 
-def get_clubs(limit: Optional[int] = 10, 
-              offset: Optional[int] = 0, 
-              has_parent_club: Optional[bool] = None, 
-              search: Optional[str] = None) -> List[Club]:
-    
-    params = {
+_club_mapper = mapper_for(Club)
+_game_report_mapper = mapper_for(GameReport)
+_player_traditional_mapper = lazy_mapper_for(PlayerTraditionalStatistics)
+
+
+def _clubs_params(limit: Optional[int], offset: Optional[int],
+                  has_parent_club: Optional[bool], search: Optional[str]) -> dict:
+    return {
         "Limit": limit,
         "Offset": offset,
         "hasParentClub": has_parent_club,
         "search": search
     }
 
+
+def get_clubs(limit: Optional[int] = 10, 
+              offset: Optional[int] = 0, 
+              has_parent_club: Optional[bool] = None, 
+              search: Optional[str] = None) -> List[Club]:
+    
+    params = _clubs_params(limit, offset, has_parent_club, search)
+
     # Use the utility function to make the API request
     data = make_euroleague_request_v3("clubs", params)
+    return map_clubs(data)
+
 
-    clubs_data = []
-    for club in data.get('data', []):
-        
-        # Convert country dict to Country object
-        if 'country' in club and club['country']:
-            club['country'] = Country(**club['country']) 
-        if club['images'].get('crest', False):
-            club['images'] = Images(**club['images']) 
-        else:
-            club['images'] = Images(crest="")
-        
-        # Convert venue and handle images
-        if 'venue' in club and club['venue']:
-            venue_data = club['venue']
-            
-            # Check if 'images' exists and is a dictionary
-            if 'images' in venue_data and isinstance(venue_data['images'], dict):
-                images_data = venue_data['images']
-                
-                # Use empty string if 'crest' is missing
-                crest_value = images_data.get('crest', "")
-                
-                # Assign to the Images class
-                venue_data['images'] = Images(crest=crest_value)
-            else:
-                venue_data['images'] = Images(crest="")  # Set empty string if no images exist
-            
-            # Convert venue dict to Venue object
-            club['venue'] = Venue(**venue_data)  
-        
-        # Convert venueBackup and handle images similarly
-        if 'venueBackup' in club and club['venueBackup']:
-            venue_backup_data = club['venueBackup']
-            
-            # Handle images in venueBackup the same way
-            if 'images' in venue_backup_data and isinstance(venue_backup_data['images'], dict):
-                images_data = venue_backup_data['images']
-                crest_value = images_data.get('crest', "")
-                venue_backup_data['images'] = Images(crest=crest_value)
-            else:
-                venue_backup_data['images'] = Images(crest="")  # Set empty string if no images exist
-            
-            club['venueBackup'] = Venue(**venue_backup_data)  # Convert venueBackup dict to Venue object
-        
-        # Convert club dict to Club object
-        clubs_data.append(Club(**club))  
-
-    return clubs_data
-
-
-def get_club_by_code(club_code: ClubCode) -> Club:
+async def get_clubs_async(limit: Optional[int] = 10,
+                          offset: Optional[int] = 0,
+                          has_parent_club: Optional[bool] = None,
+                          search: Optional[str] = None) -> List[Club]:
+    """
+    Async variant of get_clubs.
+    """
+    params = _clubs_params(limit, offset, has_parent_club, search)
+    data = await make_euroleague_request_v3_async("clubs", params)
+    return map_clubs(data)
+
+
+def map_clubs(data: dict) -> List[Club]:
+    """
+    Maps a `clubs` listing response to Club objects.
+    """
+    return [_club_mapper(club) for club in data.get('data', [])]
+
+
+def get_club_by_code(club_code: ClubCode) -> Optional[Club]:
     """
     Fetches a club by its code from the Euroleague API using ClubCode enum.
     
@@ -85,36 +79,22 @@ def get_club_by_code(club_code: ClubCode) -> Club:
     endpoint = f"clubs/{club_code.name}"
     
     data = make_euroleague_request_v3(endpoint)
-    
-    # Convert to Club object
-    if 'country' in data and data['country']:
-        data['country'] = Country(**data['country'])
-    
-    if data['images'].get('crest', False):
-        data['images'] = Images(**data['images'])
-    else:
-        data['images'] = Images(crest="")
-
-    if 'venue' in data and data['venue']:
-        venue_data = data['venue']
-        if 'images' in venue_data and isinstance(venue_data['images'], dict):
-            images_data = venue_data['images']
-            crest_value = images_data.get('crest', "")
-            venue_data['images'] = Images(crest=crest_value)
-        else:
-            venue_data['images'] = Images(crest="")
-        data['venue'] = Venue(**venue_data)
-    
-    if 'venueBackup' in data and data['venueBackup']:
-        venue_backup_data = data['venueBackup']
-        if 'images' in venue_backup_data and isinstance(venue_backup_data['images'], dict):
-            crest_value = venue_backup_data['images'].get('crest', "")
-            venue_backup_data['images'] = Images(crest=crest_value)
-        else:
-            venue_backup_data['images'] = Images(crest="")
-        data['venueBackup'] = Venue(**venue_backup_data)
+    return map_club(data)
 
-    return Club(**data)
+
+async def get_club_by_code_async(club_code: ClubCode) -> Optional[Club]:
+    """
+    Async variant of get_club_by_code.
+    """
+    data = await make_euroleague_request_v3_async(f"clubs/{club_code.name}")
+    return map_club(data)
+
+
+def map_club(data: dict) -> Optional[Club]:
+    """
+    Maps a single `clubs/{code}` response to a Club object, or None for an empty (failed) response.
+    """
+    return _club_mapper(data) if data else None
 
 
 def get_club_info(club_code: ClubCode) -> str:
@@ -133,7 +113,15 @@ def get_club_info(club_code: ClubCode) -> str:
     # Return the 'info' field from the response
     return data.get('info', '')
 
-def get_game_report(competition_code: CompetitionCode, year: int, game_code: int) -> GameReport:
+
+async def get_club_info_async(club_code: str) -> str:
+    """
+    Async variant of get_club_info.
+    """
+    data = await make_euroleague_request_v3_async(f"clubs/{club_code}/info")
+    return data.get('info', '')
+
+def get_game_report(competition_code: CompetitionCode, year: int, game_code: int) -> Optional[GameReport]:
     """
     Fetch the game report for a specific game using the competitionCode, seasonCode, and gameCode.
     
@@ -145,78 +133,119 @@ def get_game_report(competition_code: CompetitionCode, year: int, game_code: int
     Returns:
         GameReport: The game report object containing detailed game information.
     """
-    season_code = f"{competition_code.name}{year}"  # Construct seasonCode
-    endpoint = f"competitions/{competition_code.name}/seasons/{season_code}/games/{game_code}/report"
-    data = make_euroleague_request_v3(endpoint)
-    
-    # Map the API data to strawberry types manually
-    season_data = data.get('season', {})
-    season = Season(
-        name=season_data.get('name'),
-        code=season_data.get('code'),
-        alias=season_data.get('alias'),
-        competitionCode=season_data.get('competitionCode'),
-        year=season_data.get('year'),
-        startDate=season_data.get('startDate')
-    )
-    
-    group_data = data.get('group', {})
-    group = Group(
-        id=group_data.get('id'),
-        order=group_data.get('order'),
-        name=group_data.get('name'),
-        rawName=group_data.get('rawName')
-    )
+    data = (_local_game_report(competition_code, year, game_code)
+            or make_euroleague_request_v3(game_report_endpoint(competition_code, year, game_code)))
+    return map_game_report(data)
+
+
+async def get_game_report_async(competition_code: CompetitionCode, year: int, game_code: int) -> Optional[GameReport]:
+    """
+    Async variant of get_game_report.
+    """
+    data = (await _local_game_report_async(competition_code, year, game_code)
+            or await make_euroleague_request_v3_async(game_report_endpoint(competition_code, year, game_code)))
+    return map_game_report(data)
+
+
+async def get_game_reports_async(competition_code: CompetitionCode, year: int, game_codes: List[int],
+                                 concurrency: Optional[int] = None) -> List[GameReportResult]:
+    """
+    Fetches many game reports concurrently.
     
-    # Handle GameClub mapping with crest handling for both local and road teams
-    def map_game_club(club_data):
-        if 'images' in club_data and isinstance(club_data['images'], dict):
-            images_data = club_data['images']
-            crest_value = images_data.get('crest', "")
-            club_data['images'] = Images(crest=crest_value)
-        else:
-            club_data['images'] = Images(crest="")  # Set empty string if no images exist
-        
-        return GameClub(**club_data)
+    Args:
+        competition_code (CompetitionCode): The enum value representing the competition code.
+        year (int): The year of the season (YYYY format).
+        game_codes (List[int]): The game codes, in the order results should be returned.
+        concurrency (Optional[int]): Maximum reports in flight, capped at MAX_GAME_REPORTS_CONCURRENCY.
     
-    local_team_data = data.get('local', {})
-    local_team = GameTeam(
-        club=map_game_club(local_team_data.get('club', {})),
-        score=local_team_data.get('score'),
-        standingsScore=local_team_data.get('standingsScore')
+    Returns:
+        List[GameReportResult]: One result per game code, in request order. A failed fetch
+        sets `error` on its own result instead of failing the whole batch.
+    """
+    if len(game_codes) > MAX_GAME_REPORTS:
+        raise ValueError(f"At most {MAX_GAME_REPORTS} game reports can be requested at once")
+    limit = min(concurrency or GAME_REPORTS_CONCURRENCY, MAX_GAME_REPORTS_CONCURRENCY)
+    fetched = await gather_bounded(
+        [lambda game_code=game_code: _fetch_game_report_payload(competition_code, year, game_code)
+         for game_code in game_codes],
+        limit
     )
+
+    results = []
+    for game_code, data in zip(game_codes, fetched):
+        if isinstance(data, BaseException):
+            results.append(GameReportResult(gameCode=game_code, report=None, error=describe_upstream_error(data)))
+            continue
+        try:
+            results.append(GameReportResult(gameCode=game_code, report=map_game_report(data), error=None))
+        except (KeyError, TypeError, AttributeError) as e:
+            results.append(GameReportResult(gameCode=game_code, report=None, error=f"Unexpected report payload: {e}"))
+    if any(result.error is not None for result in results):
+        # Per-item errors may be transient, so the response must not be cached
+        limit_result_lifetime(time.time())
+    return results
+
+
+async def _fetch_game_report_payload(competition_code: CompetitionCode, year: int, game_code: int) -> dict:
+    local = await _local_game_report_async(competition_code, year, game_code)
+    if local is not None:
+        return local
+    return await fetch_euroleague_v3_async(game_report_endpoint(competition_code, year, game_code))
+
+
+def _local_game_report(competition_code: CompetitionCode, year: int, game_code: int) -> Optional[dict]:
+    if local_store is None:
+        return None
+    return local_store.game_report(competition_code.name, year, game_code)
+
+
+async def _local_game_report_async(competition_code: CompetitionCode, year: int, game_code: int) -> Optional[dict]:
+    if local_store is None:
+        return None
+    return await local_store.game_report_async(competition_code.name, year, game_code)
+
+
+def game_report_endpoint(competition_code: CompetitionCode, year: int, game_code: int) -> str:
+    season_code = f"{competition_code.name}{year}"  # Construct seasonCode
+    return f"competitions/{competition_code.name}/seasons/{season_code}/games/{game_code}/report"
+
+
+def map_game_report(data: dict) -> Optional[GameReport]:
+    """
+    Maps a game report response to a GameReport object, or None for an empty (failed) response.
+    """
+    return _game_report_mapper(data) if data else None
+
+
+def get_player_traditional(
+    competition_code: CompetitionCode,
+    season_mode: Optional[SeasonMode] = None,
+    season_code: Optional[int] = None,
+    from_season_code: Optional[int] = None,
+    to_season_code: Optional[int] = None,
+    phase_type_code: Optional[PhaseTypeCode] = None,
+    statistic_mode: Optional[StatsMode] = None,
+    statistic_sort_mode: Optional[StatsSortMode] = None,
+    statistic: Optional[Stats] = None,
+    sort_direction: Optional[SortDirection] = None,
+    offset: Optional[int] = 0,
+    limit: Optional[int] = 10
+) -> PlayerTraditionalResponse:
     
-    road_team_data = data.get('road', {})
-    road_team = GameTeam(
-        club=map_game_club(road_team_data.get('club', {})),
-        score=road_team_data.get('score'),
-        standingsScore=road_team_data.get('standingsScore')
+    endpoint, params = _player_traditional_request(
+        competition_code, season_mode, season_code, from_season_code, to_season_code, phase_type_code,
+        statistic_mode, statistic_sort_mode, statistic, sort_direction, offset, limit
     )
     
-    # Map the rest of the fields
-    return GameReport(
-        gameCode=data.get('gameCode'),
-        season=season,
-        group=group,
-        phaseType=PhaseType(**data.get('phaseType', {})),
-        round=data.get('round'),
-        roundAlias=data.get('roundAlias'),
-        roundName=data.get('roundName'),
-        played=data.get('played'),
-        date=data.get('date'),
-        confirmedDate=data.get('confirmedDate'),
-        confirmedHour=data.get('confirmedHour'),
-        localTimeZone=data.get('localTimeZone'),
-        localDate=data.get('localDate'),
-        utcDate=data.get('utcDate'),
-        local=local_team,
-        road=road_team,
-        localLast5Form=data.get('localLast5Form', []),
-        roadLast5Form=data.get('roadLast5Form', [])
-    )
+    # Make the request
+    data = _local_player_traditional(
+        competition_code, season_mode, season_code, from_season_code, to_season_code, phase_type_code,
+        statistic_mode, statistic_sort_mode, statistic, sort_direction, offset, limit
+    ) or make_euroleague_request_v3(endpoint, params=params)
+    return map_player_traditional(data)
 
 
-def get_player_traditional(
+async def get_player_traditional_async(
     competition_code: CompetitionCode,
     season_mode: Optional[SeasonMode] = None,
     season_code: Optional[int] = None,
@@ -228,9 +257,206 @@ def get_player_traditional(
     statistic: Optional[Stats] = None,
     sort_direction: Optional[SortDirection] = None,
     offset: Optional[int] = 0,
-    limit: Optional[int] = 10
+    limit: Optional[int] = 10,
+    min_games_played: Optional[float] = None,
+    team_code: Optional[str] = None,
+    min_age: Optional[int] = None,
+    max_age: Optional[int] = None,
+    all_rows: bool = False,
+    derived_metrics: bool = True
 ) -> PlayerTraditionalResponse:
+    """
+    Async variant of get_player_traditional.
+
+    The full leaderboard for the competition, seasons, phase and statistic mode is fetched once
+    and cached. Sorting by any stat in STAT_FIELDS, paging and the extra filters are then
+    served locally; other statistics are sorted upstream and filtered locally. With
+    `all_rows`, every row from `offset` on is returned and `limit` is ignored. Derived metrics
+    are skipped when `derived_metrics` is False, e.g. when the query does not select them.
+    """
+    if all_rows:
+        limit = None
+    if statistic_sort_mode is not None:
+        if any(value is not None for value in (min_games_played, team_code, min_age, max_age)):
+            raise ValueError("Filters cannot be combined with statisticSortMode")
+        if all_rows:
+            total, players = await _fetch_all_player_traditional_rows(
+                competition_code, season_mode, season_code, from_season_code, to_season_code, phase_type_code,
+                statistic_mode, statistic_sort_mode, statistic, sort_direction
+            )
+            return map_player_traditional({'total': total, 'players': players[offset or 0:]}, derived_metrics)
+        endpoint, params = _player_traditional_request(
+            competition_code, season_mode, season_code, from_season_code, to_season_code, phase_type_code,
+            statistic_mode, statistic_sort_mode, statistic, sort_direction, offset, limit
+        )
+        data = await make_euroleague_request_v3_async(endpoint, params=params)
+        return map_player_traditional(data, derived_metrics)
+
+    local_sort = statistic in STAT_FIELDS or (statistic is None and sort_direction is None)
+    upstream_sort = (None, None) if local_sort else (statistic, sort_direction)
+    key = (competition_code, season_mode, season_code, from_season_code, to_season_code,
+           phase_type_code, statistic_mode) + upstream_sort
+    leaderboard = await leaderboard_cache.get(key, lambda: _fetch_leaderboard(
+        competition_code, season_mode, season_code, from_season_code, to_season_code,
+        phase_type_code, statistic_mode, *upstream_sort
+    ))
+    with span("leaderboard.query", rows=len(leaderboard.rows)):
+        total, players = leaderboard.query(
+            statistic=statistic if local_sort else None,
+            descending=sort_direction != SortDirection.Ascending,
+            offset=offset,
+            limit=limit,
+            min_games_played=min_games_played,
+            team_code=team_code,
+            min_age=min_age,
+            max_age=max_age
+        )
+    return map_player_traditional({'total': total, 'players': players}, derived_metrics)
+
+
+async def _fetch_leaderboard(
+    competition_code: CompetitionCode,
+    season_mode: Optional[SeasonMode],
+    season_code: Optional[int],
+    from_season_code: Optional[int],
+    to_season_code: Optional[int],
+    phase_type_code: Optional[PhaseTypeCode],
+    statistic_mode: Optional[StatsMode],
+    statistic: Optional[Stats],
+    sort_direction: Optional[SortDirection]
+) -> Leaderboard:
+    if _uses_local_player_traditional(season_mode, season_code, from_season_code, to_season_code,
+                                      phase_type_code, statistic_mode, None, statistic, sort_direction):
+        stored = await local_store.player_traditional_async(competition_code.name, season_code)
+        if stored is not None:
+            return Leaderboard(stored[1], stored[0])
+
+    total, players = await _fetch_all_player_traditional_rows(
+        competition_code, season_mode, season_code, from_season_code, to_season_code, phase_type_code,
+        statistic_mode, None, statistic, sort_direction
+    )
+    return Leaderboard(players, total)
+
+
+async def iter_player_traditional_rows_async(
+    competition_code: CompetitionCode,
+    season_mode: Optional[SeasonMode] = None,
+    season_code: Optional[int] = None,
+    from_season_code: Optional[int] = None,
+    to_season_code: Optional[int] = None,
+    phase_type_code: Optional[PhaseTypeCode] = None,
+    statistic_mode: Optional[StatsMode] = None,
+    statistic_sort_mode: Optional[StatsSortMode] = None,
+    statistic: Optional[Stats] = None,
+    sort_direction: Optional[SortDirection] = None
+) -> AsyncIterator[Tuple[int, dict]]:
+    """
+    Streams every raw row of a traditional stats leaderboard in rank order.
+
+    `total` is read from the first page; the remaining pages are fetched concurrently,
+    at most LEADERBOARD_PAGE_CONCURRENCY at a time.
     
+    Yields:
+        Tuple[int, dict]: The leaderboard total and one raw row.
+    """
+    endpoint, params = _player_traditional_request(
+        competition_code, season_mode, season_code, from_season_code, to_season_code, phase_type_code,
+        statistic_mode, statistic_sort_mode, statistic, sort_direction, None, None
+    )
+    total = None
+    async for page in iter_pages_async(endpoint, params, LEADERBOARD_PAGE_SIZE, LEADERBOARD_PAGE_CONCURRENCY):
+        if total is None:
+            total = page.get('total') or 0
+        for row in page.get('players', []):
+            yield total, row
+
+
+async def _fetch_all_player_traditional_rows(
+    competition_code: CompetitionCode,
+    season_mode: Optional[SeasonMode],
+    season_code: Optional[int],
+    from_season_code: Optional[int],
+    to_season_code: Optional[int],
+    phase_type_code: Optional[PhaseTypeCode],
+    statistic_mode: Optional[StatsMode],
+    statistic_sort_mode: Optional[StatsSortMode],
+    statistic: Optional[Stats],
+    sort_direction: Optional[SortDirection]
+) -> Tuple[int, List[dict]]:
+    total, players = 0, []
+    try:
+        async for total, row in iter_player_traditional_rows_async(
+            competition_code, season_mode, season_code, from_season_code, to_season_code, phase_type_code,
+            statistic_mode, statistic_sort_mode, statistic, sort_direction
+        ):
+            players.append(row)
+    except (httpx.HTTPError, ValueError) as e:
+        print(f"Error while fetching the traditional stats leaderboard: {e}")
+        # An empty leaderboard built from a failed fetch must not be cached
+        limit_result_lifetime(time.time())
+        return 0, []
+    return total or len(players), players
+
+
+def _uses_local_player_traditional(
+    season_mode: Optional[SeasonMode],
+    season_code: Optional[int],
+    from_season_code: Optional[int],
+    to_season_code: Optional[int],
+    phase_type_code: Optional[PhaseTypeCode],
+    statistic_mode: Optional[StatsMode],
+    statistic_sort_mode: Optional[StatsSortMode],
+    statistic: Optional[Stats],
+    sort_direction: Optional[SortDirection]
+) -> bool:
+    # Only the default single-season leaderboard is ingested
+    if local_store is None or season_code is None or season_mode not in (None, SeasonMode.Single):
+        return False
+    return all(value is None for value in (from_season_code, to_season_code, phase_type_code, statistic_mode,
+                                           statistic_sort_mode, statistic, sort_direction))
+
+
+def _local_player_traditional(
+    competition_code: CompetitionCode,
+    season_mode: Optional[SeasonMode],
+    season_code: Optional[int],
+    from_season_code: Optional[int],
+    to_season_code: Optional[int],
+    phase_type_code: Optional[PhaseTypeCode],
+    statistic_mode: Optional[StatsMode],
+    statistic_sort_mode: Optional[StatsSortMode],
+    statistic: Optional[Stats],
+    sort_direction: Optional[SortDirection],
+    offset: Optional[int],
+    limit: Optional[int]
+) -> Optional[dict]:
+    if not _uses_local_player_traditional(season_mode, season_code, from_season_code, to_season_code,
+                                          phase_type_code, statistic_mode, statistic_sort_mode, statistic,
+                                          sort_direction):
+        return None
+    stored = local_store.player_traditional(competition_code.name, season_code)
+    if stored is None:
+        return None
+    total, rows = stored
+    start = offset or 0
+    end = start + limit if limit is not None else None
+    return {"total": total, "players": rows[start:end]}
+
+
+def _player_traditional_request(
+    competition_code: CompetitionCode,
+    season_mode: Optional[SeasonMode],
+    season_code: Optional[int],
+    from_season_code: Optional[int],
+    to_season_code: Optional[int],
+    phase_type_code: Optional[PhaseTypeCode],
+    statistic_mode: Optional[StatsMode],
+    statistic_sort_mode: Optional[StatsSortMode],
+    statistic: Optional[Stats],
+    sort_direction: Optional[SortDirection],
+    offset: Optional[int],
+    limit: Optional[int]
+) -> tuple:
     endpoint = f"competitions/{competition_code.name}/statistics/players/traditional"
     
     # Prepare query parameters
@@ -247,50 +473,20 @@ def get_player_traditional(
         "Offset": offset,
         "Limit": limit
     }
-    
-    # Make the request
-    data = make_euroleague_request_v3(endpoint, params=params)
-    
-    # Map the data to the structures
-    players = [
-        PlayerTraditionalStatistics(
-            playerRanking=player_data.get('playerRanking'),
-            player=Player(
-                code=player_data['player'].get('code'),
-                name=player_data['player'].get('name'),
-                age=player_data['player'].get('age'),
-                imageUrl=player_data['player'].get('imageUrl'),
-                team=PlayerTeam(**player_data['player']['team'])
-            ),
-            gamesPlayed=player_data.get('gamesPlayed'),
-            gamesStarted=player_data.get('gamesStarted'),
-            minutesPlayed=player_data.get('minutesPlayed'),
-            pointsScored=player_data.get('pointsScored'),
-            twoPointersMade=player_data.get('twoPointersMade'),
-            twoPointersAttempted=player_data.get('twoPointersAttempted'),
-            twoPointersPercentage=player_data.get('twoPointersPercentage'),
-            threePointersMade=player_data.get('threePointersMade'),
-            threePointersAttempted=player_data.get('threePointersAttempted'),
-            threePointersPercentage=player_data.get('threePointersPercentage'),
-            freeThrowsMade=player_data.get('freeThrowsMade'),
-            freeThrowsAttempted=player_data.get('freeThrowsAttempted'),
-            freeThrowsPercentage=player_data.get('freeThrowsPercentage'),
-            offensiveRebounds=player_data.get('offensiveRebounds'),
-            defensiveRebounds=player_data.get('defensiveRebounds'),
-            totalRebounds=player_data.get('totalRebounds'),
-            assists=player_data.get('assists'),
-            steals=player_data.get('steals'),
-            turnovers=player_data.get('turnovers'),
-            blocks=player_data.get('blocks'),
-            blocksAgainst=player_data.get('blocksAgainst'),
-            foulsCommited=player_data.get('foulsCommited'),
-            foulsDrawn=player_data.get('foulsDrawn'),
-            pir=player_data.get('pir')
-        )
-        for player_data in data.get('players', [])
-    ]
-    
-    return PlayerTraditionalResponse(
-        total=data.get('total'),
-        players=players
-    )
\ No newline at end of file
+    return endpoint, params
+
+
+def map_player_traditional(data: dict, derived_metrics: bool = True) -> PlayerTraditionalResponse:
+    """
+    Maps a traditional player statistics response to a PlayerTraditionalResponse.
+
+    Rows are wrapped in lazy records, so nested players, teams and stats are only read for
+    the fields a query selects.
+    """
+    rows = data.get('players', [])
+    with span("map.player_traditional", rows=len(rows)):
+        players = [_player_traditional_mapper(player) for player in rows]
+    if derived_metrics:
+        with span("map.derived_metrics", rows=len(players)):
+            players = attach_derived_metrics(players)
+    return PlayerTraditionalResponse(total=data.get('total'), players=players)
\ No newline at end of file
@@ -0,0 +1,168 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from document_cache import document_hash
+
+# Bounds of the cache of serialized GraphQL responses
+RESULT_CACHE_MAX_ENTRIES = int(os.environ.get("EUROLEAGUE_RESULT_CACHE_MAX_ENTRIES", 2000))
+RESULT_CACHE_MAX_BYTES = int(os.environ.get("EUROLEAGUE_RESULT_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+# Longest a response is cached or advertised as fresh, even when built only from data that never expires
+RESULT_CACHE_MAX_TTL = float(os.environ.get("EUROLEAGUE_RESULT_CACHE_MAX_TTL", 24 * 60 * 60))
+# Responses valid for less than this are not cached
+RESULT_CACHE_MIN_TTL = float(os.environ.get("EUROLEAGUE_RESULT_CACHE_MIN_TTL", 1))
+
+
+@dataclass
+class CachedResult:
+    body: bytes
+    etag: str
+    expires_at: float
+
+    def max_age(self, now: Optional[float] = None) -> int:
+        return max(0, int(self.expires_at - (now or time.time())))
+
+    def headers(self) -> Dict[str, str]:
+        return {"ETag": self.etag, "Cache-Control": f"public, max-age={self.max_age()}"}
+
+
+def etag_for(body: bytes) -> str:
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def operation_key(payload: Any) -> Optional[str]:
+    """
+    Builds the result cache key of a single GraphQL request.
+
+    Args:
+        payload (Any): The decoded request: the JSON body of a POST, or the query parameters of
+            a GET with `variables` and `extensions` still JSON-encoded.
+
+    Returns:
+        Optional[str]: The document hash (the persisted query hash for hash-only requests),
+        operation name and canonical variables. None for batches, requests without a document,
+        and persisted queries that DocumentCacheExtension rejects (an unsupported version, or a
+        hash that does not match the query), so those are executed and fail instead of hitting the cache.
+    """
+    if not isinstance(payload, dict):
+        return None
+    variables, extensions = payload.get("variables"), payload.get("extensions")
+    try:
+        if isinstance(variables, str):
+            variables = json.loads(variables) if variables else None
+        if isinstance(extensions, str):
+            extensions = json.loads(extensions) if extensions else None
+    except ValueError:
+        return None
+    query = payload.get("query")
+    persisted = extensions.get("persistedQuery") if isinstance(extensions, dict) else None
+    persisted_hash = None
+    if isinstance(persisted, dict):
+        if persisted.get("version") != 1 or not isinstance(persisted.get("sha256Hash"), str):
+            return None
+        persisted_hash = persisted["sha256Hash"].lower()
+    if isinstance(query, str) and query:
+        document = document_hash(query)
+        if persisted_hash is not None and persisted_hash != document:
+            return None
+    elif persisted_hash is not None:
+        document = persisted_hash
+    else:
+        return None
+    try:
+        canonical_variables = json.dumps(variables, sort_keys=True, separators=(",", ":"))
+    except (TypeError, ValueError):
+        return None
+    return f"{document}:{payload.get('operationName') or ''}:{canonical_variables}"
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache of serialized GraphQL responses, bounded by entry count and total bytes.
+
+    Each entry expires when the first piece of data it was built from does, so finished game
+    reports live long and unplayed games only a few seconds.
+    """
+
+    def __init__(self, max_entries: int = RESULT_CACHE_MAX_ENTRIES, max_bytes: int = RESULT_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CachedResult]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.uncacheable = 0
+
+    def get(self, key: str) -> Optional[CachedResult]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at <= time.time():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key: str, body: bytes, ttl: float) -> Optional[CachedResult]:
+        """
+        Stores a serialized response valid for `ttl` seconds.
+
+        Returns:
+            Optional[CachedResult]: The entry, or None if the response lives too briefly to cache.
+        """
+        if ttl < RESULT_CACHE_MIN_TTL:
+            with self._lock:
+                self.uncacheable += 1
+            return None
+        entry = CachedResult(body=body, etag=etag_for(body), expires_at=time.time() + ttl)
+        size = len(key) + len(body)
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return entry
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the cache counters and current size.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "uncacheable": self.uncacheable,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= len(key) + len(entry.body)
+
+
+result_cache = ResultCache()
@@ -1,4 +1,16 @@
 import strawberry
 from queries import Query
+from subscriptions import Subscription
+from cost import QueryCostExtension
+from document_cache import DocumentCacheExtension
+from metrics import MetricsExtension, time_root_fields
+from tracing import TracingExtension, tracing_enabled
 
-schema = strawberry.Schema(query=Query)
+schema = strawberry.Schema(
+    query=Query,
+    subscription=Subscription,
+    # The tracing extension's resolve hook wraps every field, so it is only installed when spans are exported
+    extensions=[*([TracingExtension] if tracing_enabled() else []),
+                MetricsExtension, DocumentCacheExtension, QueryCostExtension],
+)
+time_root_fields(schema)
@@ -0,0 +1,51 @@
+import strawberry
+from typing import Iterable, List, Set, Union
+from strawberry.types.nodes import FragmentSpread, InlineFragment, SelectedField
+
+Selection = Union[SelectedField, FragmentSpread, InlineFragment]
+
+
+def _selected(selections: Iterable[Selection], path: List[str]) -> bool:
+    for selection in selections:
+        if isinstance(selection, (FragmentSpread, InlineFragment)):
+            if _selected(selection.selections, path):
+                return True
+        elif selection.name == path[0] and (len(path) == 1 or _selected(selection.selections, path[1:])):
+            return True
+    return False
+
+
+def is_selected(info: strawberry.Info, *path: str) -> bool:
+    """
+    Tells whether the current field's selection set contains a nested field.
+
+    Fragments and inline fragments are looked through, and a field selected under several
+    aliases counts once any of them selects the path.
+
+    Args:
+        info (strawberry.Info): The resolver info of the current field.
+        *path (str): GraphQL field names below the current field, e.g. ("players", "derivedMetrics").
+
+    Returns:
+        bool: Whether the path is selected.
+    """
+    return any(_selected(field.selections, list(path)) for field in info.selected_fields)
+
+
+def _names(selections: Iterable[Selection], names: Set[str]) -> Set[str]:
+    for selection in selections:
+        if isinstance(selection, (FragmentSpread, InlineFragment)):
+            _names(selection.selections, names)
+        else:
+            names.add(selection.name)
+    return names
+
+
+def selected_names(info: strawberry.Info) -> Set[str]:
+    """
+    Returns the names of the fields selected directly on the current field, fragments included.
+    """
+    names: Set[str] = set()
+    for field in info.selected_fields:
+        _names(field.selections, names)
+    return names
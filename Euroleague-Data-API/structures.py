@@ -48,6 +48,25 @@ class Club:
     images: Optional[Images]
 
 
+@strawberry.type
+class ClubEdge:
+    cursor: str
+    node: Club
+
+@strawberry.type
+class PageInfo:
+    hasNextPage: bool
+    hasPreviousPage: bool
+    startCursor: Optional[str]
+    endCursor: Optional[str]
+
+@strawberry.type
+class ClubConnection:
+    edges: List[ClubEdge]
+    pageInfo: PageInfo
+    totalCount: int
+
+
 @strawberry.type
 class Season:
     name: Optional[str]
@@ -108,6 +127,28 @@ class GameReport:
     localLast5Form: Optional[List[str]]
     roadLast5Form: Optional[List[str]]
 
+@strawberry.type
+class GameReportResult:
+    gameCode: int
+    report: Optional[GameReport]
+    error: Optional[str]
+
+@strawberry.type
+class GameUpdate:
+    gameCode: int
+    # Only fields listed in changedFields are set; the first update carries all of them
+    changedFields: List[str]
+    localScore: Optional[int] = None
+    roadScore: Optional[int] = None
+    localStandingsScore: Optional[int] = None
+    roadStandingsScore: Optional[int] = None
+    played: Optional[bool] = None
+
+@strawberry.input
+class GameCodeRange:
+    start: int
+    end: int
+
 @strawberry.type
 class PlayerTeam:
     code: Optional[str]
@@ -123,6 +164,25 @@ class Player:
     imageUrl: Optional[str]
     team: Optional[PlayerTeam]
 
+@strawberry.type
+class PlayerDerivedMetrics:
+    twoPointersPercentage: Optional[float]
+    threePointersPercentage: Optional[float]
+    freeThrowsPercentage: Optional[float]
+    trueShootingPercentage: Optional[float]
+    effectiveFieldGoalPercentage: Optional[float]
+    assistTurnoverRatio: Optional[float]
+    pointsPer36: Optional[float]
+    reboundsPer36: Optional[float]
+    assistsPer36: Optional[float]
+    stealsPer36: Optional[float]
+    blocksPer36: Optional[float]
+    turnoversPer36: Optional[float]
+    pirPer36: Optional[float]
+    usagePer36: Optional[float]
+    threePointAttemptRate: Optional[float]
+    freeThrowRate: Optional[float]
+
 @strawberry.type
 class PlayerTraditionalStatistics:
     playerRanking: Optional[int]
@@ -151,6 +211,7 @@ class PlayerTraditionalStatistics:
     foulsCommited: Optional[float]
     foulsDrawn: Optional[float]
     pir: Optional[float]
+    derivedMetrics: Optional[PlayerDerivedMetrics] = None
 
 @strawberry.type
 class PlayerTraditionalResponse:
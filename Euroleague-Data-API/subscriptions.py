@@ -0,0 +1,25 @@
+import strawberry
+from typing import AsyncGenerator
+from structures import GameUpdate
+from live_games import live_game_scheduler
+from enum_code import CompetitionCode
+
+@strawberry.type
+class Subscription:
+
+    @strawberry.subscription
+    async def game_updates(self, competition_code: CompetitionCode, year: int, game_code: int) -> AsyncGenerator[GameUpdate, None]:
+        """
+        Streams score, standingsScore and played changes of a live game.
+
+        Args:
+            competition_code (CompetitionCode): The enum value representing the competition code.
+            year (int): The year of the season (YYYY format).
+            game_code (int): The game code.
+
+        Returns:
+            AsyncGenerator[GameUpdate, None]: The full state first, then only changed fields.
+            The stream ends once the game is played.
+        """
+        async for update in live_game_scheduler.subscribe(competition_code, year, game_code):
+            yield update
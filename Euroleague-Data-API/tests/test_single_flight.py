@@ -0,0 +1,152 @@
+"""
+Concurrency tests of the request coalescing in utilities: N concurrent callers of one key
+must share a single upstream call, its result and its exception.
+
+Run from the Euroleague-Data-API directory:
+
+    python -m pytest tests
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utilities import AsyncSingleFlight, SingleFlight  # noqa: E402
+
+CALLERS = 32
+
+
+class UpstreamError(Exception):
+    pass
+
+
+def run_threads(flight: SingleFlight, fetch) -> list:
+    """
+    Calls flight.do from CALLERS threads released at once, returning each outcome in thread order.
+    """
+    barrier = threading.Barrier(CALLERS)
+    outcomes = [None] * CALLERS
+
+    def caller(index: int) -> None:
+        barrier.wait()
+        try:
+            outcomes[index] = flight.do("key", fetch)
+        except UpstreamError as e:
+            outcomes[index] = e
+
+    threads = [threading.Thread(target=caller, args=(index,)) for index in range(CALLERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    return outcomes
+
+
+def test_threads_share_one_call():
+    calls = []
+
+    def fetch():
+        calls.append(threading.current_thread())
+        # Stays in flight long enough for every released thread to join the call
+        time.sleep(0.2)
+        return {"data": [1, 2, 3]}
+
+    outcomes = run_threads(SingleFlight(), fetch)
+
+    assert len(calls) == 1
+    results = [result for result, _ in outcomes]
+    assert all(result is results[0] for result in results)
+    assert sorted(shared for _, shared in outcomes) == [False] + [True] * (CALLERS - 1)
+
+
+def test_threads_all_receive_the_exception():
+    calls = []
+    error = UpstreamError("upstream down")
+
+    def fetch():
+        calls.append(threading.current_thread())
+        time.sleep(0.2)
+        raise error
+
+    outcomes = run_threads(SingleFlight(), fetch)
+
+    assert len(calls) == 1
+    assert all(outcome is error for outcome in outcomes)
+
+
+def test_threads_call_again_after_completion():
+    flight = SingleFlight()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return len(calls)
+
+    assert flight.do("key", fetch) == (1, False)
+    assert flight.do("key", fetch) == (2, False)
+
+
+def test_coroutines_share_one_call():
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"data": [1, 2, 3]}
+
+    async def main():
+        flight = AsyncSingleFlight()
+        return await asyncio.gather(*(flight.do("key", fetch) for _ in range(CALLERS)))
+
+    outcomes = asyncio.run(main())
+
+    assert len(calls) == 1
+    results = [result for result, _ in outcomes]
+    assert all(result is results[0] for result in results)
+    assert [shared for _, shared in outcomes] == [False] + [True] * (CALLERS - 1)
+
+
+def test_coroutines_all_receive_the_exception():
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        raise UpstreamError("upstream down")
+
+    async def main():
+        flight = AsyncSingleFlight()
+        return await asyncio.gather(*(flight.do("key", fetch) for _ in range(CALLERS)), return_exceptions=True)
+
+    outcomes = asyncio.run(main())
+
+    assert len(calls) == 1
+    assert all(isinstance(outcome, UpstreamError) for outcome in outcomes)
+    assert all(outcome is outcomes[0] for outcome in outcomes)
+
+
+def test_cancelled_coroutine_does_not_cancel_the_call():
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "report"
+
+    async def main():
+        flight = AsyncSingleFlight()
+        first = asyncio.ensure_future(flight.do("key", fetch))
+        second = asyncio.ensure_future(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == ("report", True)
+    assert len(calls) == 1
@@ -0,0 +1,250 @@
+import contextlib
+import inspect
+import json
+import os
+import re
+import secrets
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from strawberry.extensions import SchemaExtension
+
+# Writes one JSON line per finished span to this file when set
+TRACE_PATH = os.environ.get("EUROLEAGUE_TRACE_PATH")
+# Header carrying a caller's trace ID when it does not send a W3C traceparent; echoed on responses
+TRACE_ID_HEADER = os.environ.get("EUROLEAGUE_TRACE_ID_HEADER", "X-Trace-Id")
+
+_TRACEPARENT = re.compile(r"^[0-9a-f]{2}-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+_TRACE_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+@dataclass
+class Span:
+    trace: "Trace"
+    span_id: str
+    parent_id: Optional[str]
+    name: str
+    start: float
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    duration: Optional[float] = None
+    error: Optional[str] = None
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start,
+            "duration_ms": None if self.duration is None else round(self.duration * 1000, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class Trace:
+    """
+    The spans of one operation. They are exported together once the root span ends.
+    """
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.spans: List[Span] = []
+        self.finished = False
+
+
+class SpanExporter:
+    """
+    Receives the spans of every finished trace. Subclass it and pass an instance to
+    set_exporter() to send spans elsewhere.
+    """
+
+    def export(self, spans: List[Span]) -> None:
+        raise NotImplementedError
+
+    def shutdown(self) -> None:
+        pass
+
+
+class JsonLinesExporter(SpanExporter):
+    """
+    Appends each span as one JSON object per line to a local file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        lines = "".join(json.dumps(span.as_dict(), default=str) + "\n" for span in spans)
+        with self._lock:
+            self._file.write(lines)
+            self._file.flush()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+_exporter: Optional[SpanExporter] = JsonLinesExporter(TRACE_PATH) if TRACE_PATH else None
+current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def set_exporter(exporter: Optional[SpanExporter]) -> None:
+    """
+    Replaces the span exporter. None disables tracing.
+
+    GraphQL spans come from TracingExtension, which schema.py only installs when an exporter is
+    set at import time. Call this before importing schema to trace operations and resolvers.
+    """
+    global _exporter
+    if _exporter is not None and _exporter is not exporter:
+        _exporter.shutdown()
+    _exporter = exporter
+
+
+def tracing_enabled() -> bool:
+    return _exporter is not None
+
+
+def new_trace_id() -> str:
+    return secrets.token_hex(16)
+
+
+def incoming_trace(headers: Any) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Reads the caller's trace context from request headers.
+
+    Args:
+        headers (Any): A case-insensitive mapping of request headers.
+
+    Returns:
+        Tuple[Optional[str], Optional[str]]: The trace ID and the caller's span ID from a W3C
+        `traceparent`, else the trace ID from TRACE_ID_HEADER with no parent, else (None, None).
+    """
+    match = _TRACEPARENT.match(headers.get("traceparent", "").strip().lower())
+    if match:
+        return match.group(1), match.group(2)
+    trace_id = headers.get(TRACE_ID_HEADER, "").strip()
+    if _TRACE_ID.match(trace_id):
+        return trace_id, None
+    return None, None
+
+
+@contextlib.contextmanager
+def span(name: str, trace_id: Optional[str] = None, parent_id: Optional[str] = None,
+         **attributes: Any) -> Iterator[Optional[Span]]:
+    """
+    Times a block as a child of the current span, or as the root of a new trace.
+
+    Yields None when tracing is disabled, so instrumented code costs one check. Exceptions
+    are recorded on the span and re-raised. The trace is exported when its root span ends.
+    Spans started after that, e.g. in background refreshes spawned by the operation, are dropped.
+
+    Args:
+        name (str): The span name, e.g. 'upstream.fetch'.
+        trace_id (Optional[str]): The trace to join when starting a root span, e.g. from incoming_trace().
+        parent_id (Optional[str]): The caller's span ID for a root span.
+        **attributes (Any): Initial span attributes.
+    """
+    if _exporter is None:
+        yield None
+        return
+    parent = current_span.get()
+    if parent is not None and parent.trace.finished:
+        yield None
+        return
+    trace = parent.trace if parent is not None else Trace(trace_id or new_trace_id())
+    current = Span(
+        trace=trace,
+        span_id=secrets.token_hex(8),
+        parent_id=parent.span_id if parent is not None else parent_id,
+        name=name,
+        start=time.time(),
+        attributes=attributes,
+    )
+    trace.spans.append(current)
+    token = current_span.set(current)
+    started = time.perf_counter()
+    try:
+        yield current
+    except BaseException as error:
+        current.error = f"{type(error).__name__}: {error}"
+        raise
+    finally:
+        current.duration = time.perf_counter() - started
+        current_span.reset(token)
+        if parent is None:
+            trace.finished = True
+            exporter = _exporter
+            if exporter is not None:
+                exporter.export(trace.spans)
+
+
+def current_trace_id() -> Optional[str]:
+    current = current_span.get()
+    return None if current is None else current.trace.trace_id
+
+
+class TracingExtension(SchemaExtension):
+    """
+    Adds an operation span, with parse, validate and execute children and one span per async
+    resolver, which includes every root field. Joins the HTTP request's trace when there is one.
+    """
+
+    def on_operation(self):
+        if not tracing_enabled():
+            yield
+            return
+        context = self.execution_context
+        trace_id = parent_id = None
+        request = context.context.get("request") if isinstance(context.context, dict) else None
+        if request is not None and current_span.get() is None:
+            trace_id, parent_id = incoming_trace(request.headers)
+        with span("graphql.operation", trace_id, parent_id, operation_name=context.operation_name) as current:
+            yield
+            if current is not None:
+                try:
+                    current.set(operation_type=context.operation_type.value)
+                except RuntimeError:
+                    pass
+                if context.result is not None and context.result.errors:
+                    current.set(errors=len(context.result.errors))
+
+    def on_parse(self):
+        with span("graphql.parse"):
+            yield
+
+    def on_validate(self):
+        with span("graphql.validate"):
+            yield
+
+    def on_execute(self):
+        with span("graphql.execute"):
+            yield
+
+    def resolve(self, _next, root, info, *args, **kwargs):
+        result = _next(root, info, *args, **kwargs)
+        # Every root field is async; synchronous fields are attribute reads on mapped objects
+        if tracing_enabled() and inspect.isawaitable(result):
+            return self._traced(result, info)
+        return result
+
+    @staticmethod
+    async def _traced(result, info):
+        with span("graphql.resolve", field=f"{info.parent_type.name}.{info.field_name}", path=_path(info.path)):
+            return await result
+
+
+def _path(path) -> str:
+    keys = []
+    while path is not None:
+        keys.append(str(path.key))
+        path = path.prev
+    return ".".join(reversed(keys))
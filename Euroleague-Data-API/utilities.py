@@ -1,48 +1,601 @@
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future
+import httpx
 import requests
-from typing import Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+from typing import Dict, Any, List, Optional, AsyncIterator, Callable, Awaitable, Tuple
+from cache import (CacheEntry, response_cache, cache_key, ttl_for, serve_stale, stale_window_for,
+                   limit_result_lifetime)
+from metrics import observe_upstream
+from persistent_cache import persistent_cache
+from refresh import RefreshScheduler
+from tracing import span
+
+# Overridable to point the API at a stand-in upstream, e.g. benchmarks/fake_upstream.py
+EUROLEAGUE_API_BASE_URL = os.environ.get("EUROLEAGUE_API_BASE_URL", "https://api-live.euroleague.net").rstrip("/")
+EUROLEAGUE_API_URL_V3 = f"{EUROLEAGUE_API_BASE_URL}/v3"
+EUROLEAGUE_API_URL_V2 = f"{EUROLEAGUE_API_BASE_URL}/v2"
+
+# Upstream client settings, overridable through the environment or configure_client()
+CONNECT_TIMEOUT = float(os.environ.get("EUROLEAGUE_CONNECT_TIMEOUT", 3.05))
+READ_TIMEOUT = float(os.environ.get("EUROLEAGUE_READ_TIMEOUT", 10))
+POOL_CONNECTIONS = int(os.environ.get("EUROLEAGUE_POOL_CONNECTIONS", 4))
+POOL_MAXSIZE = int(os.environ.get("EUROLEAGUE_POOL_MAXSIZE", 32))
+MAX_RETRIES = int(os.environ.get("EUROLEAGUE_MAX_RETRIES", 3))
+BACKOFF_BASE = float(os.environ.get("EUROLEAGUE_BACKOFF_BASE", 0.25))
+BACKOFF_MAX = float(os.environ.get("EUROLEAGUE_BACKOFF_MAX", 8))
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_async_client: Optional[httpx.AsyncClient] = None
+_async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+# Pending aclose() tasks of replaced async clients, referenced until they finish
+_closing_tasks: set = set()
+
+
+def _discard_async_client(client: httpx.AsyncClient, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+    """
+    Closes a replaced async client on the event loop it was created on.
+
+    Called from that loop, the close is scheduled as a task; from another thread, it is
+    submitted to the loop. A client whose loop has already been closed cannot be awaited
+    there any more, and its connections were released with the loop.
+    """
+    if loop is None or loop.is_closed():
+        return
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    try:
+        if running is loop:
+            task = loop.create_task(client.aclose())
+            _closing_tasks.add(task)
+            task.add_done_callback(_closing_tasks.discard)
+        elif loop.is_running():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        else:
+            loop.run_until_complete(client.aclose())
+    except Exception as e:
+        print(f"Error closing the upstream async client: {e}")
+
+
+def configure_client(connect_timeout: Optional[float] = None,
+                     read_timeout: Optional[float] = None,
+                     pool_connections: Optional[int] = None,
+                     pool_maxsize: Optional[int] = None,
+                     max_retries: Optional[int] = None,
+                     backoff_base: Optional[float] = None,
+                     backoff_max: Optional[float] = None) -> None:
+    """
+    Overrides the upstream client settings. The shared session and async client are closed,
+    and rebuilt with the new settings on next use.
+
+    Args:
+        connect_timeout (Optional[float]): Seconds to wait for the TCP/TLS connection.
+        read_timeout (Optional[float]): Seconds to wait for the response body.
+        pool_connections (Optional[int]): Number of per-host connection pools to keep.
+        pool_maxsize (Optional[int]): Maximum keep-alive connections per host.
+        max_retries (Optional[int]): Retries on connection errors, 429 and 5xx responses.
+        backoff_base (Optional[float]): Base delay in seconds for exponential backoff.
+        backoff_max (Optional[float]): Upper bound in seconds for a single backoff delay.
+    """
+    global CONNECT_TIMEOUT, READ_TIMEOUT, POOL_CONNECTIONS, POOL_MAXSIZE, MAX_RETRIES, BACKOFF_BASE, BACKOFF_MAX
+    global _session, _async_client, _async_client_loop
+    with _session_lock:
+        if connect_timeout is not None:
+            CONNECT_TIMEOUT = connect_timeout
+        if read_timeout is not None:
+            READ_TIMEOUT = read_timeout
+        if pool_connections is not None:
+            POOL_CONNECTIONS = pool_connections
+        if pool_maxsize is not None:
+            POOL_MAXSIZE = pool_maxsize
+        if max_retries is not None:
+            MAX_RETRIES = max_retries
+        if backoff_base is not None:
+            BACKOFF_BASE = backoff_base
+        if backoff_max is not None:
+            BACKOFF_MAX = backoff_max
+        if _session is not None:
+            _session.close()
+            _session = None
+        # The async client is bound to its event loop, so it is closed there and rebuilt lazily
+        if _async_client is not None:
+            _discard_async_client(_async_client, _async_client_loop)
+            _async_client = None
+            _async_client_loop = None
+
+
+def get_session() -> requests.Session:
+    """
+    Returns the shared keep-alive session used for all upstream requests.
+
+    Returns:
+        requests.Session: A session with pooled HTTP(S) adapters.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                # Retries are handled in _get_with_retries so they share the jittered backoff
+                adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=0)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Returns the shared async client for the running event loop.
+
+    Returns:
+        httpx.AsyncClient: A client with a keep-alive connection pool.
+    """
+    global _async_client, _async_client_loop
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client_loop is not loop:
+        if _async_client is not None:
+            _discard_async_client(_async_client, _async_client_loop)
+        limits = httpx.Limits(max_connections=POOL_CONNECTIONS * POOL_MAXSIZE, max_keepalive_connections=POOL_MAXSIZE)
+        timeout = httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT)
+        _async_client = httpx.AsyncClient(limits=limits, timeout=timeout)
+        _async_client_loop = loop
+    return _async_client
+
+
+async def close_async_client() -> None:
+    """
+    Closes the shared async client, e.g. on application shutdown.
+    """
+    global _async_client, _async_client_loop
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+        _async_client_loop = None
+
+
+async def close_clients() -> None:
+    """
+    Closes the shared session and async client on application shutdown, along with async
+    clients replaced by configure_client() whose close is still pending.
+    """
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+    await close_async_client()
+    if _closing_tasks:
+        await asyncio.gather(*_closing_tasks, return_exceptions=True)
+
+
+def backoff_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """
+    Computes the delay before the next retry using exponential backoff with full jitter.
+
+    Args:
+        attempt (int): The zero-based number of the attempt that just failed.
+        retry_after (Optional[str]): The upstream Retry-After header, if any.
+
+    Returns:
+        float: The number of seconds to sleep.
+    """
+    if retry_after:
+        try:
+            return min(float(retry_after), BACKOFF_MAX)
+        except ValueError:
+            pass
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+def _get_with_retries(url: str, params: Optional[Dict[str, Any]]) -> requests.Response:
+    session = get_session()
+    attempt = 0
+    while True:
+        start = time.perf_counter()
+        try:
+            with span("upstream.request", url=url, attempt=attempt) as current:
+                response = session.get(url, params=params, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+                if current is not None:
+                    current.set(status=response.status_code, bytes=len(response.content))
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            observe_upstream(url, "error", time.perf_counter() - start)
+            if attempt >= MAX_RETRIES:
+                raise
+            time.sleep(backoff_delay(attempt))
+        else:
+            observe_upstream(url, str(response.status_code), time.perf_counter() - start, len(response.content))
+            if response.status_code not in RETRY_STATUS_CODES or attempt >= MAX_RETRIES:
+                response.raise_for_status()  # Raise an error for bad status codes
+                return response
+            retry_after = response.headers.get("Retry-After")
+            response.close()
+            time.sleep(backoff_delay(attempt, retry_after))
+        attempt += 1
+
+
+async def _get_with_retries_async(url: str, params: Optional[Dict[str, Any]]) -> httpx.Response:
+    client = get_async_client()
+    attempt = 0
+    while True:
+        start = time.perf_counter()
+        try:
+            with span("upstream.request", url=url, attempt=attempt) as current:
+                response = await client.get(url, params=params)
+                if current is not None:
+                    current.set(status=response.status_code, bytes=len(response.content))
+        except httpx.TransportError:
+            observe_upstream(url, "error", time.perf_counter() - start)
+            if attempt >= MAX_RETRIES:
+                raise
+            await asyncio.sleep(backoff_delay(attempt))
+        else:
+            observe_upstream(url, str(response.status_code), time.perf_counter() - start, len(response.content))
+            if response.status_code not in RETRY_STATUS_CODES or attempt >= MAX_RETRIES:
+                response.raise_for_status()  # Raise an error for bad status codes
+                return response
+            await asyncio.sleep(backoff_delay(attempt, response.headers.get("Retry-After")))
+        attempt += 1
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key across threads: the first caller runs the
+    function and every caller that arrives while it is in flight receives the same result.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Runs fn once per in-flight key.
+
+        Args:
+            key (str): The coalescing key.
+            fn (Callable[[], Any]): The function to run if no call for key is in flight.
+
+        Returns:
+            Tuple[Any, bool]: The result and whether it was shared from another caller's call.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+        if not leader:
+            return future.result(), True
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            with self._lock:
+                del self._calls[key]
+        return result, False
+
+
+class AsyncSingleFlight:
+    """
+    Coalesces concurrent coroutine calls with the same key on one event loop.
+
+    The call runs in its own task, so a cancelled caller does not cancel the fetch for the others.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Task] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Awaits fn once per in-flight key.
+
+        Args:
+            key (str): The coalescing key.
+            fn (Callable[[], Awaitable[Any]]): The coroutine function to run if no call for key is in flight.
+
+        Returns:
+            Tuple[Any, bool]: The result and whether it was shared from another caller's call.
+        """
+        task = self._calls.get(key)
+        shared = task is not None
+        if not shared:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task), shared
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+
+def describe_upstream_error(error: BaseException) -> str:
+    """
+    Returns a short, client-safe description of a failed upstream call.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        return f"Upstream returned HTTP {error.response.status_code}"
+    if isinstance(error, httpx.TimeoutException):
+        return "Upstream request timed out"
+    if isinstance(error, httpx.TransportError):
+        return "Upstream connection failed"
+    if isinstance(error, ValueError):
+        return "Upstream returned an invalid response"
+    return str(error) or type(error).__name__
+
+
+async def gather_bounded(calls: List[Callable[[], Awaitable[Any]]], limit: int) -> List[Any]:
+    """
+    Runs coroutine functions concurrently with at most `limit` in flight.
+
+    Args:
+        calls (List[Callable[[], Awaitable[Any]]]): The coroutine functions to run.
+        limit (int): The maximum number of concurrent calls.
+
+    Returns:
+        List[Any]: The results (or raised exceptions) in call order.
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def run(call):
+        async with semaphore:
+            return await call()
+
+    return await asyncio.gather(*(run(call) for call in calls), return_exceptions=True)
+
+
+_flights = SingleFlight()
+_async_flights = AsyncSingleFlight()
+
+
+def _cached_entry(key: str, stale_window: float = 0.0) -> Optional[CacheEntry]:
+    entry = response_cache.get(key, stale_window)
+    if entry is None and persistent_cache is not None:
+        entry = persistent_cache.get(key, stale_window)
+        if entry is not None:
+            # Promote to memory, keeping the original fetch time so the TTL is not extended
+            response_cache.set(key, entry.body, entry.ttl, entry.fetched_at)
+    return entry
+
+
+async def _cached_entry_async(key: str, stale_window: float = 0.0) -> Optional[CacheEntry]:
+    # Like _cached_entry, with the SQLite read in a worker thread so it never blocks the event loop
+    entry = response_cache.get(key, stale_window)
+    if entry is None and persistent_cache is not None:
+        entry = await asyncio.to_thread(persistent_cache.get, key, stale_window)
+        if entry is not None:
+            response_cache.set(key, entry.body, entry.ttl, entry.fetched_at)
+    return entry
+
+
+def _store(endpoint: str, key: str, body: bytes, data: Dict[str, Any]) -> None:
+    ttl = ttl_for(endpoint, data)
+    fetched_at = time.time()
+    response_cache.set(key, body, ttl, fetched_at)
+    if persistent_cache is not None:
+        persistent_cache.set(key, body, ttl, fetched_at)
+
+
+async def _store_async(endpoint: str, key: str, body: bytes, data: Dict[str, Any]) -> None:
+    ttl = ttl_for(endpoint, data)
+    fetched_at = time.time()
+    response_cache.set(key, body, ttl, fetched_at)
+    if persistent_cache is not None:
+        await asyncio.to_thread(persistent_cache.set, key, body, ttl, fetched_at)
+
+
+def _fetch_v3(endpoint: str, url: str, params: Dict[str, Any], key: str) -> Tuple[bytes, Dict[str, Any]]:
+    response = _get_with_retries(url, params)
+    data = response.json()
+    _store(endpoint, key, response.content, data)
+    return response.content, data
+
+
+async def _fetch_v3_async(endpoint: str, url: str, params: Dict[str, Any], key: str) -> Tuple[bytes, Dict[str, Any]]:
+    response = await _get_with_retries_async(url, params)
+    with span("upstream.decode", bytes=len(response.content)):
+        data = response.json()
+    await _store_async(endpoint, key, response.content, data)
+    return response.content, data
 
-EUROLEAGUE_API_URL_V3 = "https://api-live.euroleague.net/v3"
-EUROLEAGUE_API_URL_V2 = "https://api-live.euroleague.net/v2"
 
 def make_euroleague_request_v3(endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Makes a request to the Euroleague API and returns the response data.
-    
+
     Args:
         endpoint (str): The API endpoint (e.g., '/clubs').
         params (Optional[Dict[str, Any]]): The query parameters to include in the request.
-    
+
     Returns:
         Dict[str, Any]: The JSON response data from the API.
     """
     url = f"{EUROLEAGUE_API_URL_V3}/{endpoint}"
     # remove all None values from the params
     params = {k: v for k, v in (params or {}).items() if v is not None}
+    key = cache_key(endpoint, params)
+    entry = _cached_entry(key)
+    if entry is not None:
+        return json.loads(entry.body)
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()  # Raise an error for bad status codes
-        return response.json()
+        (body, data), shared = _flights.do(key, lambda: _fetch_v3(endpoint, url, params, key))
     except requests.exceptions.RequestException as e:
         print(f"Error while making request to {url}: {e}")
         return {}
+    # Callers may mutate the returned dict, so coalesced callers get their own copy
+    return json.loads(body) if shared else data
 
 def make_euroleague_request_v2(endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Makes a request to the Euroleague API and returns the response data.
-    
+
     Args:
         endpoint (str): The API endpoint (e.g., '/clubs').
         params (Optional[Dict[str, Any]]): The query parameters to include in the request.
-    
+
     Returns:
         Dict[str, Any]: The JSON response data from the API.
     """
     url = f"{EUROLEAGUE_API_URL_V2}/{endpoint}"
-    
+
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()  # Raise an error for bad status codes
+        response = _get_with_retries(url, params)
         return response.json()
     except requests.exceptions.RequestException as e:
         print(f"Error while making request to {url}: {e}")
         return {}
+
+
+async def make_euroleague_request_v3_async(endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Async counterpart of make_euroleague_request_v3 that does not block the event loop.
+
+    Args:
+        endpoint (str): The API endpoint (e.g., '/clubs').
+        params (Optional[Dict[str, Any]]): The query parameters to include in the request.
+
+    Returns:
+        Dict[str, Any]: The JSON response data from the API.
+    """
+    try:
+        return await fetch_euroleague_v3_async(endpoint, params)
+    except (httpx.HTTPError, ValueError) as e:
+        print(f"Error while making request to {EUROLEAGUE_API_URL_V3}/{endpoint}: {e}")
+        # A result built from a failed request must not be cached
+        limit_result_lifetime(time.time())
+        return {}
+
+async def fetch_euroleague_v3_async(endpoint: str, params: Optional[Dict[str, Any]] = None,
+                                    bypass_cache: bool = False) -> Dict[str, Any]:
+    """
+    Like make_euroleague_request_v3_async, but raises instead of returning an empty dict,
+    for callers that report errors per item.
+
+    Args:
+        endpoint (str): The API endpoint (e.g., '/clubs').
+        params (Optional[Dict[str, Any]]): The query parameters to include in the request.
+        bypass_cache (bool): Skip cached responses, e.g. when polling a live game. The fresh
+            response still replaces the cached one.
+
+    Returns:
+        Dict[str, Any]: The JSON response data from the API.
+
+    Raises:
+        httpx.HTTPError: If the request fails after retries or returns an error status.
+        ValueError: If the response body is not valid JSON.
+    """
+    url = f"{EUROLEAGUE_API_URL_V3}/{endpoint}"
+    # remove all None values from the params
+    params = {k: v for k, v in (params or {}).items() if v is not None}
+    key = cache_key(endpoint, params)
+    with span("upstream.fetch", endpoint=endpoint, params=params) as current:
+        entry = None
+        if not bypass_cache:
+            refresh_scheduler.record(key, endpoint, params)
+            entry = await _cached_entry_async(key, stale_window_for(key) if serve_stale.get() else 0.0)
+        if entry is not None:
+            if entry.is_fresh():
+                limit_result_lifetime(entry.expires_at)
+            else:
+                # Stale-while-revalidate: answer now, refresh in the background
+                refresh_scheduler.revalidate(key, endpoint, params)
+                limit_result_lifetime(time.time())
+            if current is not None:
+                current.set(cache="hit" if entry.is_fresh() else "stale")
+            with span("upstream.decode", bytes=len(entry.body)):
+                return json.loads(entry.body)
+        if current is not None:
+            current.set(cache="bypass" if bypass_cache else "miss")
+        (body, data), shared = await _async_flights.do(key, lambda: _fetch_v3_async(endpoint, url, params, key))
+        ttl = ttl_for(endpoint, data)
+        limit_result_lifetime(None if ttl is None else time.time() + ttl)
+        if current is not None:
+            current.set(coalesced=shared)
+        # Callers may mutate the returned dict, so coalesced callers get their own copy
+        if not shared:
+            return data
+        with span("upstream.decode", bytes=len(body)):
+            return json.loads(body)
+
+
+async def _refresh_v3(endpoint: str, params: Dict[str, Any]) -> None:
+    url = f"{EUROLEAGUE_API_URL_V3}/{endpoint}"
+    key = cache_key(endpoint, params)
+    await _async_flights.do(key, lambda: _fetch_v3_async(endpoint, url, params, key))
+
+
+refresh_scheduler = RefreshScheduler(_refresh_v3)
+
+async def make_euroleague_request_v2_async(endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Async counterpart of make_euroleague_request_v2 that does not block the event loop.
+
+    Args:
+        endpoint (str): The API endpoint (e.g., '/clubs').
+        params (Optional[Dict[str, Any]]): The query parameters to include in the request.
+
+    Returns:
+        Dict[str, Any]: The JSON response data from the API.
+    """
+    url = f"{EUROLEAGUE_API_URL_V2}/{endpoint}"
+    # requests drops None values on its own, httpx does not
+    params = {k: v for k, v in (params or {}).items() if v is not None}
+    try:
+        response = await _get_with_retries_async(url, params)
+        return response.json()
+    except (httpx.HTTPError, ValueError) as e:
+        print(f"Error while making request to {url}: {e}")
+        return {}
+
+
+async def iter_pages_async(endpoint: str, params: Optional[Dict[str, Any]], page_size: int,
+                           concurrency: int) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Streams every page of an Offset/Limit paginated v3 endpoint in offset order.
+
+    The first page is fetched alone to read `total`; the remaining pages are then fetched
+    concurrently, at most `concurrency` at a time, and yielded as soon as all earlier
+    pages have been yielded.
+
+    Args:
+        endpoint (str): The API endpoint.
+        params (Optional[Dict[str, Any]]): The query parameters; Offset and Limit are overridden.
+        page_size (int): The Limit requested for each page.
+        concurrency (int): The maximum number of pages in flight.
+
+    Yields:
+        Dict[str, Any]: The decoded pages, starting with the first one.
+    """
+    params = dict(params or {})
+    first_page = await fetch_euroleague_v3_async(endpoint, {**params, "Offset": 0, "Limit": page_size})
+    yield first_page
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def fetch_page(offset: int) -> Dict[str, Any]:
+        async with semaphore:
+            return await fetch_euroleague_v3_async(endpoint, {**params, "Offset": offset, "Limit": page_size})
+
+    total = first_page.get("total") or 0
+    tasks = [asyncio.ensure_future(fetch_page(offset)) for offset in range(page_size, total, page_size)]
+    try:
+        for task in tasks:
+            yield await task
+    finally:
+        # The consumer stopped early or a page failed: drop the pages still in flight
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,185 @@
+import datetime
+import os
+import time
+import httpx
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+from enum_code import CompetitionCode, SeasonMode
+from club_index import club_index
+from resolvers import game_report_endpoint, get_player_traditional_async
+from utilities import fetch_euroleague_v3_async, gather_bounded, describe_upstream_error
+
+
+def _current_season_year() -> int:
+    # Seasons are named after the year they start in, around September
+    today = datetime.date.today()
+    return today.year if today.month >= 8 else today.year - 1
+
+
+# Set EUROLEAGUE_WARMUP=0 to start without warming the caches
+WARMUP_ENABLED = os.environ.get("EUROLEAGUE_WARMUP", "1") != "0"
+# Comma separated competition codes and the season year to warm up
+WARMUP_COMPETITIONS = [code.strip() for code in os.environ.get("EUROLEAGUE_WARMUP_COMPETITIONS", "E").split(",") if code.strip()]
+WARMUP_SEASON = int(os.environ.get("EUROLEAGUE_WARMUP_SEASON", _current_season_year()))
+WARMUP_CONCURRENCY = int(os.environ.get("EUROLEAGUE_WARMUP_CONCURRENCY", 16))
+# Stop probing game codes after this many consecutive codes are not found
+WARMUP_MAX_MISSING_GAMES = int(os.environ.get("EUROLEAGUE_WARMUP_MAX_MISSING_GAMES", 10))
+# Give up on the game reports after this many consecutive failed fetches, e.g. while the upstream is down
+WARMUP_MAX_FAILED_GAMES = int(os.environ.get("EUROLEAGUE_WARMUP_MAX_FAILED_GAMES", 10))
+# Never probe past this game code, whatever the upstream answers
+WARMUP_MAX_GAME_CODE = int(os.environ.get("EUROLEAGUE_WARMUP_MAX_GAME_CODE", 1000))
+
+
+class StageProgress:
+    """
+    Counters of one warm-up stage.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.total = 0
+        self.done = 0
+        self.failed = 0
+        # Why the stage stopped early, if it did
+        self.error: Optional[str] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "total": self.total, "done": self.done, "failed": self.failed, "error": self.error}
+
+
+class Warmup:
+    """
+    Prefetches the data most requests need right after startup, so the first users hit warm caches.
+
+    Stages run in order, each with up to `concurrency` upstream requests in flight:
+    the full `clubs` listing, the current season's game reports (probed by ascending game code),
+    `clubs/{code}` and `clubs/{code}/info` for every club playing in those games, and the
+    default traditional stats leaderboards. A failed fetch is counted and skipped, and the game
+    report probe gives up after `max_failed_games` consecutive failures, recording why on its
+    stage. Warm-up is best effort and always ends ready.
+    """
+
+    def __init__(self, competitions: List[str] = WARMUP_COMPETITIONS, season: int = WARMUP_SEASON,
+                 concurrency: int = WARMUP_CONCURRENCY, max_missing_games: int = WARMUP_MAX_MISSING_GAMES,
+                 max_failed_games: int = WARMUP_MAX_FAILED_GAMES, max_game_code: int = WARMUP_MAX_GAME_CODE):
+        self.competitions = [CompetitionCode[code] for code in competitions]
+        self.season = season
+        self.concurrency = concurrency
+        self.max_missing_games = max_missing_games
+        self.max_failed_games = max_failed_games
+        self.max_game_code = max_game_code
+        self.state = "pending"
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.stages = {name: StageProgress(name) for name in ("clubs", "game_reports", "club_details", "leaderboards")}
+        self._club_codes: Set[str] = set()
+
+    @property
+    def ready(self) -> bool:
+        return self.state in ("ready", "disabled")
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Returns the warm-up state and per-stage progress, as served by the readiness endpoint.
+        """
+        end = self.finished_at or time.time()
+        return {
+            "ready": self.ready,
+            "state": self.state,
+            "season": self.season,
+            "competitions": [code.name for code in self.competitions],
+            "elapsed": round(end - self.started_at, 3) if self.started_at else None,
+            "stages": [stage.as_dict() for stage in self.stages.values()],
+        }
+
+    def skip(self) -> None:
+        self.state = "disabled"
+
+    async def run(self) -> None:
+        self.state = "running"
+        self.started_at = time.time()
+        try:
+            await self._warm_clubs()
+            for competition_code in self.competitions:
+                await self._warm_game_reports(competition_code)
+            await self._warm_club_details()
+            await self._warm_leaderboards()
+        finally:
+            self.finished_at = time.time()
+            self.state = "ready"
+
+    async def _run_stage(self, stage: StageProgress, calls: List[Callable[[], Awaitable[Any]]]) -> List[Any]:
+        stage.total += len(calls)
+        results = await gather_bounded(calls, self.concurrency)
+        for result in results:
+            if isinstance(result, BaseException):
+                stage.failed += 1
+            else:
+                stage.done += 1
+        return results
+
+    async def _warm_clubs(self) -> None:
+        stage = self.stages["clubs"]
+        stage.total += 1
+        try:
+            await club_index.refresh()
+            stage.done += 1
+        except (httpx.HTTPError, ValueError) as e:
+            stage.failed += 1
+            print(f"Warm-up failed to load the clubs listing: {e}")
+
+    async def _warm_game_reports(self, competition_code: CompetitionCode) -> None:
+        stage = self.stages["game_reports"]
+        missing_streak = failed_streak = 0
+        game_code = 1
+        while missing_streak < self.max_missing_games and game_code <= self.max_game_code:
+            batch = list(range(game_code, min(game_code + self.concurrency, self.max_game_code + 1)))
+            game_code += len(batch)
+            stage.total += len(batch)
+            results = await gather_bounded(
+                [lambda code=code: fetch_euroleague_v3_async(game_report_endpoint(competition_code, self.season, code))
+                 for code in batch],
+                self.concurrency
+            )
+            for result in results:
+                if isinstance(result, httpx.HTTPStatusError) and result.response.status_code == 404:
+                    # Probing past the last scheduled game is expected, not a failure
+                    stage.total -= 1
+                    missing_streak += 1
+                    failed_streak = 0
+                    continue
+                if isinstance(result, BaseException):
+                    # A failure says nothing about whether the game exists, so the missing streak is kept
+                    stage.failed += 1
+                    failed_streak += 1
+                    if failed_streak >= self.max_failed_games:
+                        stage.error = (f"{competition_code.name}: gave up after {failed_streak} consecutive "
+                                       f"failed fetches: {describe_upstream_error(result)}")
+                    continue
+                missing_streak = failed_streak = 0
+                stage.done += 1
+                for side in ('local', 'road'):
+                    code = ((result.get(side) or {}).get('club') or {}).get('code')
+                    if code:
+                        self._club_codes.add(code)
+            if failed_streak >= self.max_failed_games:
+                print(f"Warm-up stopped probing game reports: {stage.error}")
+                return
+
+    async def _warm_club_details(self) -> None:
+        codes = sorted(self._club_codes)
+        await self._run_stage(
+            self.stages["club_details"],
+            [lambda code=code: fetch_euroleague_v3_async(f"clubs/{code}") for code in codes]
+            + [lambda code=code: fetch_euroleague_v3_async(f"clubs/{code}/info") for code in codes]
+        )
+
+    async def _warm_leaderboards(self) -> None:
+        # The leaderboards playerTraditional serves for a plain season query, with and without seasonMode
+        await self._run_stage(
+            self.stages["leaderboards"],
+            [lambda code=code, mode=mode: get_player_traditional_async(code, season_mode=mode, season_code=self.season)
+             for code in self.competitions for mode in (None, SeasonMode.Single)]
+        )
+
+
+warmup = Warmup()
@@ -13,6 +13,9 @@ setup(
     install_requires=[
         "strawberry-graphql",
         "requests",
+        "httpx",
+        "numpy",
+        "starlette",
         "uvicorn",
     ],
     classifiers=[